@@ -0,0 +1,228 @@
+"""Benchmarks for the data structures and algorithms in this repository.
+
+Run this file directly to run every benchmark, or call the individual
+functions from an interpreter. Sizes can be scaled down with the <n>
+parameters for a quick run.
+"""
+from __future__ import annotations
+import gc
+import random
+import threading
+import time
+import tracemalloc
+from typing import *
+
+import recursion
+import recursive_sorting
+from linked_list import (ArrayLinkedList, ConcurrentLinkedList, LinkedList,
+                         UnrolledLinkedList)
+
+
+def _retained_memory(build: Callable[[], Any]) -> int:
+    """Return the number of bytes allocated by build() that are still alive
+    when it returns.
+    """
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    size, unused_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def _timed(func: Callable[[], Any], repeat: int = 3) -> float:
+    """Return the best time in seconds, out of <repeat> runs, that it takes
+    to call func().
+    """
+    best = float('inf')
+    for unused_ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_linked_list_memory(n: int = 1_000_000) -> None:
+    """Compare the memory used by LinkedList and ArrayLinkedList to hold
+    <n> integers.
+    """
+    items = list(range(n))
+    results = [
+        ('LinkedList', _retained_memory(lambda: LinkedList(items))),
+        ('ArrayLinkedList', _retained_memory(lambda: ArrayLinkedList(items))),
+        ("ArrayLinkedList('q')",
+         _retained_memory(lambda: ArrayLinkedList(items, 'q'))),
+    ]
+    print(f'Memory to hold {n} ints (excluding the ints themselves):')
+    for name, size in results:
+        print(f'  {name:<24}{size / n:8.1f} bytes/item')
+
+
+def bench_unrolled_traversal(n: int = 1_000_000, capacity: int = 64) -> None:
+    """Compare traversal-heavy methods of LinkedList and UnrolledLinkedList
+    on <n> integers, and the number of nodes each one allocates.
+    """
+    plain = LinkedList(range(n))
+    unrolled = UnrolledLinkedList(range(n), capacity)
+    print(f'Traversals over {n} ints (best of 3, seconds):')
+    print(f'  {"method":<12}{"LinkedList":>12}{"Unrolled":>12}{"speedup":>10}')
+    for name in ['__str__', 'average', '__len__', 'do_stuff', '__iter__']:
+        if name == '__iter__':
+            plain_time = _timed(lambda: sum(1 for unused_ in plain))
+            unrolled_time = _timed(lambda: sum(1 for unused_ in unrolled))
+        else:
+            plain_time = _timed(getattr(plain, name))
+            unrolled_time = _timed(getattr(unrolled, name))
+        print(f'  {name:<12}{plain_time:12.4f}{unrolled_time:12.4f}'
+              f'{plain_time / max(unrolled_time, 1e-9):9.1f}x')
+    print(f'  nodes: {len(plain)} vs {unrolled.block_count()} blocks '
+          f'of up to {capacity} items')
+
+
+class _GlobalLockList:
+    """The baseline for ConcurrentLinkedList: a LinkedList behind one lock.
+    """
+    def __init__(self, items: Iterable = ()) -> None:
+        self._lst = LinkedList(items)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lst)
+
+    def __iter__(self) -> Iterator:
+        with self._lock:
+            return iter(list(self._lst))
+
+    def __contains__(self, item: Any) -> bool:
+        with self._lock:
+            return any(x == item for x in self._lst)
+
+    def insert(self, index: int, item: Any) -> None:
+        with self._lock:
+            self._lst.insert(index, item)
+
+    def pop(self, index: int) -> Any:
+        with self._lock:
+            return self._lst.pop(index)
+
+    def average(self) -> float:
+        with self._lock:
+            return self._lst.average()
+
+
+def _run_workers(lst: Any, threads: int, ops: int, seed: int = 0) -> float:
+    """Run <threads> threads that each do <ops> random operations on <lst>,
+    and return the elapsed time in seconds. Every thread pops exactly as
+    many items as it inserts, so the length of <lst> is unchanged after.
+    """
+    def worker(rng: random.Random) -> None:
+        pending = 0
+        for unused_ in range(ops):
+            op = rng.random()
+            if op < 0.4 or (op < 0.6 and pending == 0):
+                lst.insert(rng.randrange(len(lst) // 2 + 1), 1)
+                pending += 1
+            elif op < 0.6:
+                lst.pop(rng.randrange(len(lst) // 2))
+                pending -= 1
+            elif op < 0.9:
+                unused_ = rng.randrange(100) in lst
+            else:
+                lst.average()
+        for unused_ in range(pending):
+            lst.pop(0)
+
+    workers = [threading.Thread(target=worker, args=(random.Random(seed + t),))
+               for t in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def bench_concurrent_stress(threads: int = 32, ops: int = 2_000,
+                            n: int = 1_000) -> None:
+    """Hammer a ConcurrentLinkedList of <n> ones from <threads> threads and
+    check that no item is lost or duplicated.
+    """
+    lst = ConcurrentLinkedList([1] * n)
+    elapsed = _run_workers(lst, threads, ops)
+    items = list(lst)
+    assert len(lst) == len(items) == n and items == [1] * n, len(items)
+    print(f'Stress: {threads} threads x {ops} ops on {n} items '
+          f'finished consistently in {elapsed:.2f}s')
+
+
+def bench_concurrent_throughput(n: int = 1_000, ops: int = 1_000) -> None:
+    """Compare the throughput of ConcurrentLinkedList with a LinkedList
+    behind one global lock, for mixed workloads from 1 to 8 threads.
+    """
+    print(f'Mixed operations per second on {n} items:')
+    print(f'  {"threads":<10}{"global lock":>14}{"per-node":>14}')
+    for threads in [1, 2, 4, 8]:
+        rates = []
+        for cls in [_GlobalLockList, ConcurrentLinkedList]:
+            lst = cls([1] * n)
+            rates.append(threads * ops / _run_workers(lst, threads, ops))
+        print(f'  {threads:<10}{rates[0]:14.0f}{rates[1]:14.0f}')
+
+
+def bench_flat_nested(n: int = 1_000_000) -> None:
+    """Compare the nested-list queries in recursion on a nested list of
+    about <n> ints and on its FlatNested form.
+    """
+    side = round(n ** (1 / 3))
+    nested = [[[i * side + j + k for k in range(side)] for j in range(side)]
+              for i in range(side)]
+    print(f'Nested-list queries over {side ** 3} ints (best of 3, seconds):')
+    print(f'  conversion to FlatNested: '
+          f'{_timed(lambda: recursion.FlatNested(nested)):.4f}')
+    flat = recursion.FlatNested(nested)
+    print(f'  {"query":<20}{"nested":>10}{"flat":>10}{"speedup":>10}')
+    queries = [('count_matches', (side,)), ('all_greater_than', (-1,)),
+               ('depth', ()), ('consistent_depth', ())]
+    for name, args in queries:
+        func = getattr(recursion, name)
+        nested_time = _timed(lambda: func(nested, *args))
+        flat_time = _timed(lambda: func(flat, *args))
+        print(f'  {name:<20}{nested_time:10.4f}{flat_time:10.4f}'
+              f'{nested_time / max(flat_time, 1e-9):9.1f}x')
+
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    """Return the peak number of bytes allocated while func() runs.
+    """
+    gc.collect()
+    tracemalloc.start()
+    func()
+    unused_size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def bench_inplace_sorting(n: int = 200_000) -> None:
+    """Compare the non-mutating sorts in recursive_sorting with their
+    in-place versions on <n> random floats.
+    """
+    rng = random.Random(0)
+    items = [rng.random() for unused_ in range(n)]
+    print(f'Sorting {n} random floats (best of 3):')
+    print(f'  {"function":<20}{"seconds":>10}{"peak MB":>10}')
+    for name in ['mergesort', 'mergesort_inplace', 'quicksort',
+                 'quicksort_inplace']:
+        func = getattr(recursive_sorting, name)
+        seconds = _timed(lambda: func(items[:]))
+        peak = _peak_memory(lambda: func(items[:]))
+        print(f'  {name:<20}{seconds:10.3f}{peak / 2 ** 20:10.1f}')
+
+
+if __name__ == '__main__':
+    bench_linked_list_memory()
+    bench_unrolled_traversal()
+    bench_concurrent_stress()
+    bench_concurrent_throughput()
+    bench_flat_nested()
+    bench_inplace_sorting()
@@ -1,6 +1,21 @@
 from __future__ import annotations
+import mmap
+import pickle
+import random
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from math import fsum, isqrt
+from operator import gt, lt
 from typing import *
 
+try:
+    import numpy
+except ImportError:  # NumPy is optional; aggregates fall back to pure Python.
+    numpy = None
+
 
 class _Node:
     """A node in a linked list.
@@ -14,38 +29,582 @@ class _Node:
     next:
         The next node in the list, or None if there are no more nodes.
     """
+    # Nodes have no instance __dict__, which roughly halves their size.
+    __slots__ = ('item', 'next')
     item: Any
     next: Optional[_Node]
 
-    def __init__(self, item: Any) -> None:
-        """Initialize a new node storing <item>, with no next node.
+    def __init__(self, item: Any, next: Optional[_Node] = None) -> None:
+        """Initialize a new node storing <item>, followed by <next>.
+        """
+        self.item = item
+        self.next = next  # By default, pointing to nothing
+
+
+class _DoublyNode(_Node):
+    """A node in a doubly-linked list.
+
+    === Attributes ===
+    prev:
+        The previous node in the list, or None if this is the first node.
+    """
+    __slots__ = ('prev',)
+    prev: Optional[_DoublyNode]
+
+    def __init__(self, item: Any, next: Optional[_DoublyNode] = None,
+                 prev: Optional[_DoublyNode] = None) -> None:
+        """Initialize a new node storing <item>, between <prev> and <next>.
+        """
+        _Node.__init__(self, item, next)
+        self.prev = prev
+
+
+class _LockingNode(_Node):
+    """A node in a ConcurrentLinkedList.
+
+    === Attributes ===
+    lock:
+        The lock that must be held to change this node's next reference, or
+        to unlink this node.
+    """
+    __slots__ = ('lock',)
+    lock: threading.Lock
+
+    def __init__(self, item: Any, next: Optional[_LockingNode] = None) -> None:
+        """Initialize a new unlocked node storing <item>, followed by <next>.
         """
+        _Node.__init__(self, item, next)
+        self.lock = threading.Lock()
+
+
+class _Piece:
+    """A run of consecutive items in a list being edited by
+    LinkedList.apply_batch, stored as a node in a treap keyed by position.
+
+    Like _Node, this is a private class used only in this module.
+
+    === Attributes ===
+    start:
+        The index in the original list of the first item in this run, or -1
+        if this run is a single newly inserted item.
+    length:
+        The number of items in this run.
+    item:
+        The inserted item, if start is -1.
+    size:
+        The total number of items in the subtree rooted at this piece.
+    priority:
+        The treap priority; it is never smaller than its children's.
+    left, right:
+        The pieces before and after this one, as treaps.
+    """
+    __slots__ = ('start', 'length', 'item', 'size', 'priority',
+                 'left', 'right')
+    start: int
+    length: int
+    item: Any
+    size: int
+    priority: float
+    left: Optional[_Piece]
+    right: Optional[_Piece]
+
+    def __init__(self, start: int, length: int, item: Any = None,
+                 priority: Optional[float] = None) -> None:
+        """Initialize a new piece with no children.
+        """
+        self.start = start
+        self.length = length
         self.item = item
-        self.next = None  # Initially pointing to nothing
+        self.size = length
+        self.priority = random.random() if priority is None else priority
+        self.left = None
+        self.right = None
+
+    def update(self) -> None:
+        """Recompute this piece's size from its children.
+        """
+        self.size = self.length
+        if self.left is not None:
+            self.size += self.left.size
+        if self.right is not None:
+            self.size += self.right.size
+
+
+def _split_pieces(root: Optional[_Piece], k: int) -> \
+        Tuple[Optional[_Piece], Optional[_Piece]]:
+    """Split the treap <root> into one holding its first <k> items and one
+    holding the rest, cutting a run in two if necessary.
+
+    The treap is walked down one path without recursion: each piece on it
+    is hung off the right spine of the first treap or the left spine of the
+    second, and sizes are fixed on the way back up.
+    """
+    before = after = None
+    # The pieces whose right (left) child is the next piece to join the
+    # first (second) treap.
+    before_tail = after_tail = None
+    cut_off = None
+    path = []
+    node = root
+    while node is not None:
+        path.append(node)
+        left_size = 0 if node.left is None else node.left.size
+        if k <= left_size:
+            if after_tail is None:
+                after = node
+            else:
+                after_tail.left = node
+            after_tail = node
+            node = node.left
+            continue
+        if before_tail is None:
+            before = node
+        else:
+            before_tail.right = node
+        before_tail = node
+        if k >= left_size + node.length:
+            k -= left_size + node.length
+            node = node.right
+        else:
+            # Cut this run. Only runs of original items can be longer than
+            # 1. The cut-off part gets its own priority and is merged with
+            # the pieces after it, to keep the treap balanced.
+            offset = k - left_size
+            cut_off = _merge_pieces(
+                _Piece(node.start + offset, node.length - offset), node.right)
+            node.length = offset
+            node = None
+    if before_tail is not None:
+        before_tail.right = None
+    if after_tail is not None:
+        after_tail.left = None
+    for node in reversed(path):
+        node.update()
+    return before, _merge_pieces(cut_off, after)
+
+
+def _merge_pieces(first: Optional[_Piece],
+                  second: Optional[_Piece]) -> Optional[_Piece]:
+    """Return a treap holding the items of <first> followed by those of
+    <second>.
+
+    This walks down the right spine of <first> and the left spine of
+    <second> without recursion, always taking the piece with the higher
+    priority next.
+    """
+    root = parent = None
+    parent_right = False
+    path = []
+    while first is not None and second is not None:
+        if first.priority >= second.priority:
+            node, first = first, first.right
+            node_right = True
+        else:
+            node, second = second, second.left
+            node_right = False
+        if parent is None:
+            root = node
+        elif parent_right:
+            parent.right = node
+        else:
+            parent.left = node
+        # What is left of <first> and <second> is merged into node.right if
+        # it came from <first>, or node.left if it came from <second>.
+        parent, parent_right = node, node_right
+        path.append(node)
+    rest = first if first is not None else second
+    if parent is None:
+        return rest
+    elif parent_right:
+        parent.right = rest
+    else:
+        parent.left = rest
+    for node in reversed(path):
+        node.update()
+    return root
+
+
+def _in_order(root: Optional[_Piece]) -> List[_Piece]:
+    """Return the pieces of the treap <root> in order.
+    """
+    pieces = []
+    stack = []
+    curr = root
+    while stack or curr is not None:
+        while curr is not None:
+            stack.append(curr)
+            curr = curr.left
+        curr = stack.pop()
+        pieces.append(curr)
+        curr = curr.right
+    return pieces
+
+
+# Finite floats are summed exactly by _Aggregates as integer multiples of
+# 2 ** -_FLOAT_SHIFT, the smallest subnormal float, which divides them all.
+_FLOAT_SHIFT = 1074
+_FLOAT_MAX = sys.float_info.max
+
+
+class _Aggregates:
+    """Running aggregates over the numbers in a LinkedList.
+
+    Like _Node, this is a private class used only in this module.
+
+    The count, sum and sum of squares are kept exactly, so removing a value
+    undoes adding it, with none of the cancellation a floating-point
+    running mean suffers. Ints are summed as ints, finite floats as integer
+    multiples of 2 ** -_FLOAT_SHIFT, and any other numbers (such as
+    Fractions) in their own arithmetic. The mean and variance are worked out
+    from the exact sums when asked for, correctly rounded for ints and
+    floats. The minimum and maximum cannot be repaired when the current
+    extreme value is removed; they are then marked stale and recomputed by
+    the list on demand.
+
+    === Attributes ===
+    count:
+        The number of values.
+    int_total, int_squares:
+        The sum of the int values, and of their squares.
+    float_total, float_squares:
+        The sum of the finite float values, in units of 2 ** -_FLOAT_SHIFT,
+        and of their squares, in units of 2 ** (-2 * _FLOAT_SHIFT).
+    others:
+        The number of values that are neither ints nor finite floats.
+    other_total, other_squares:
+        The sum of those values, and of their squares.
+    minimum, maximum:
+        The smallest and largest values, or None if there are none.
+    stale:
+        Whether minimum and maximum may be wrong.
+    """
+    count: int
+    int_total: int
+    int_squares: int
+    float_total: int
+    float_squares: int
+    others: int
+    other_total: Any
+    other_squares: Any
+    minimum: Any
+    maximum: Any
+    stale: bool
+
+    def __init__(self, values: Iterable = ()) -> None:
+        """Initialize aggregates over <values>.
+        """
+        self.count = 0
+        self.int_total = self.int_squares = 0
+        self.float_total = self.float_squares = 0
+        self.others = 0
+        self.other_total = self.other_squares = 0
+        self.minimum = None
+        self.maximum = None
+        self.stale = False
+        for value in values:
+            self.add(value)
+
+    def _update(self, value: Any, sign: int) -> None:
+        """Add <value> to the sums if <sign> is 1, or take it away if <sign>
+        is -1.
+        """
+        if isinstance(value, int):
+            self.int_total += sign * value
+            self.int_squares += sign * value * value
+        elif type(value) is float and -_FLOAT_MAX <= value <= _FLOAT_MAX:
+            numerator, denominator = value.as_integer_ratio()
+            scaled = numerator << (_FLOAT_SHIFT + 1 - denominator.bit_length())
+            self.float_total += sign * scaled
+            self.float_squares += sign * scaled * scaled
+        else:
+            self.others += sign
+            self.other_total += sign * value
+            self.other_squares += sign * value * value
+
+    def add(self, value: Any) -> None:
+        """Include <value> in the aggregates.
+        """
+        self.count += 1
+        self._update(value, 1)
+        if self.count == 1:
+            self.minimum = self.maximum = value
+        elif not self.stale:
+            if value < self.minimum:
+                self.minimum = value
+            if value > self.maximum:
+                self.maximum = value
+
+    def remove(self, value: Any) -> None:
+        """Exclude <value>, which was previously added, from the aggregates.
+        """
+        self.count -= 1
+        if self.count == 0:
+            self.__init__()
+            return
+        self._update(value, -1)
+        if value == self.minimum or value == self.maximum:
+            self.stale = True
+
+    def merge(self, other: _Aggregates) -> None:
+        """Include all the values aggregated by <other>.
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.__dict__.update(other.__dict__)
+            return
+        self.count += other.count
+        self.int_total += other.int_total
+        self.int_squares += other.int_squares
+        self.float_total += other.float_total
+        self.float_squares += other.float_squares
+        self.others += other.others
+        self.other_total += other.other_total
+        self.other_squares += other.other_squares
+        self.stale = self.stale or other.stale
+        if not self.stale:
+            self.minimum = min(self.minimum, other.minimum)
+            self.maximum = max(self.maximum, other.maximum)
+
+    def unmerge(self, other: _Aggregates) -> None:
+        """Exclude all the values aggregated by <other>, which must all have
+        been previously added.
+        """
+        if other.count == 0:
+            return
+        self.count -= other.count
+        if self.count == 0:
+            self.__init__()
+            return
+        self.int_total -= other.int_total
+        self.int_squares -= other.int_squares
+        self.float_total -= other.float_total
+        self.float_squares -= other.float_squares
+        self.others -= other.others
+        self.other_total -= other.other_total
+        self.other_squares -= other.other_squares
+        self.stale = True
+
+    def _mixed_sums(self) -> Tuple[Any, Any]:
+        """Return the sum of the values and of their squares, in the
+        arithmetic of the values that are neither ints nor finite floats.
+        """
+        total = self.other_total + self.int_total
+        squares = self.other_squares + self.int_squares
+        if self.float_total or self.float_squares:
+            total += self.float_total / (1 << _FLOAT_SHIFT)
+            squares += self.float_squares / (1 << 2 * _FLOAT_SHIFT)
+        return total, squares
+
+    def mean(self) -> Any:
+        """Return the mean of the values.
+        Raise a ZeroDivisionError if there are none.
+        """
+        if self.others:
+            return self._mixed_sums()[0] / self.count
+        if not self.float_total:
+            return self.int_total / self.count
+        # Python divides ints with correct rounding, however large they are.
+        return ((self.float_total + (self.int_total << _FLOAT_SHIFT))
+                / (self.count << _FLOAT_SHIFT))
+
+    def variance(self) -> Any:
+        """Return the population variance of the values.
+        Raise a ZeroDivisionError if there are none.
+        """
+        if self.others:
+            total, squares = self._mixed_sums()
+            return (squares - total * total / self.count) / self.count
+        total = self.float_total + (self.int_total << _FLOAT_SHIFT)
+        squares = self.float_squares + (self.int_squares << 2 * _FLOAT_SHIFT)
+        return ((self.count * squares - total * total)
+                / (self.count * self.count << 2 * _FLOAT_SHIFT))
 
 
 class LinkedList:
     """A linked list implementation of the List ADT.
+
+    If the list is created with aggregates=True, it keeps running
+    aggregates of its items (which must then be numbers), so that average(),
+    variance(), minimum() and maximum() take constant time.
     """
     # === Private Attributes ===
     # _first:
     #     The first node in the linked list, or None if the list is empty.
+    # _last:
+    #     The last node in the linked list, or None if the list is empty.
+    # _size:
+    #     The number of nodes in the linked list.
+    # _aggregates:
+    #     Running aggregates of the items, or None if they are not tracked.
     _first: Optional[_Node]
+    _last: Optional[_Node]
+    _size: int
+    _aggregates: Optional[_Aggregates]
+
+    # The class used to create this list's nodes.
+    _node_class = _Node
 
-    def __init__(self, items: list) -> None:
+    def __init__(self, items: Iterable = (), aggregates: bool = False) -> None:
         """Initialize a new linked list containing the given items.
 
         The first node in the linked list contains the first item
-        in <items>.
+        in <items>. <items> can be any iterable, including a generator; it
+        is consumed one item at a time and never copied.
+
+        >>> str(LinkedList(x * x for x in range(4)))
+        '[0 -> 1 -> 4 -> 9]'
         """
-        if len(items) == 0:  # No items, and an empty list!
-            self._first = None
+        self._first = None
+        self._last = None
+        self._size = 0
+        self._aggregates = None
+        self.extend(items)
+        if aggregates:
+            self.track_aggregates()
+
+    def _empty(self) -> LinkedList:
+        """Return a new empty list to hold nodes split off from this one.
+        """
+        return LinkedList()
+
+    def track_aggregates(self, enabled: bool = True) -> None:
+        """Start (or, if <enabled> is False, stop) keeping running aggregates
+        of the items in this list.
+
+        Starting takes one pass over the list; from then on every mutation
+        updates the aggregates in constant time, except bisect, which scans
+        the nodes it removes.
+        >>> lst = LinkedList([3, 1, 2])
+        >>> lst.track_aggregates()
+        >>> lst.append(6)
+        >>> lst.average(), lst.minimum(), lst.maximum(), lst.variance()
+        (3.0, 1, 6, 3.5)
+
+        The sums are exact, so removing a huge item leaves no rounding error
+        behind.
+        >>> lst = LinkedList([1e20, 1.0, 3.0])
+        >>> lst.track_aggregates()
+        >>> lst.pop(0)
+        1e+20
+        >>> lst.average(), lst.variance()
+        (2.0, 1.0)
+        """
+        self._aggregates = _Aggregates(self) if enabled else None
+
+    def __reduce__(self) -> tuple:
+        """Return the information pickle needs to rebuild this list.
+
+        The items are handed to pickle as an iterator and appended to a new
+        empty list on loading, so pickling never recurses through the nodes
+        and works for lists of any length.
+        >>> lst = pickle.loads(pickle.dumps(LinkedList(range(100000))))
+        >>> len(lst), lst[99999]
+        (100000, 99999)
+        """
+        return (self.__class__, ((), self._aggregates is not None), None,
+                iter(self))
+
+    @classmethod
+    def from_iterable(cls, items: Iterable) -> LinkedList:
+        """Return a new linked list containing the items of <items>, which
+        is consumed lazily.
+
+        >>> str(LinkedList.from_iterable(iter('abc')))
+        '[a -> b -> c]'
+        """
+        return cls(items)
+
+    def append(self, item: Any) -> None:
+        """Add <item> to the end of this list, in constant time.
+
+        >>> lst = LinkedList([1])
+        >>> lst.append(2)
+        >>> str(lst)
+        '[1 -> 2]'
+        """
+        self._link(self._last, self._node_class(item), self._size)
+
+    def extend(self, items: Iterable) -> None:
+        """Add the items of <items> to the end of this list, in order.
+
+        This takes O(len(items)) time and, apart from the new nodes,
+        constant extra memory.
+        >>> lst = LinkedList([1, 2])
+        >>> lst.extend(range(3, 6))
+        >>> str(lst)
+        '[1 -> 2 -> 3 -> 4 -> 5]'
+        >>> len(lst)
+        5
+        """
+        node_class = self._node_class
+        if isinstance(items, Sequence):
+            # Sized fast path: build the chain back to front, so that each
+            # node is created already pointing at its successor.
+            count = len(items)
+            if count == 0:
+                return
+            it = reversed(items)
+            first = last = node_class(next(it))
+            for item in it:
+                first = node_class(item, first)
         else:
-            self._first = _Node(items[0])
-            curr = self._first
-            for item in items[1:]:
-                curr.next = _Node(item)
-                curr = curr.next
+            it = iter(items)
+            for item in it:
+                first = last = node_class(item)
+                break
+            else:
+                return
+            count = 1
+            for count, item in enumerate(it, 2):
+                last.next = last = node_class(item)
+
+        if self._last is None:
+            self._first = first
+        else:
+            self._last.next = first
+        self._last = last
+        self._size += count
+        if self._aggregates is not None:
+            self._aggregate_chain(first, None)
+
+    def extendleft(self, items: Iterable) -> None:
+        """Add the items of <items> to the front of this list, one at a time.
+
+        As with collections.deque.extendleft, each item is put in front of
+        the previous one, so they end up in reverse order.
+        >>> lst = LinkedList([10])
+        >>> lst.extendleft([1, 2, 3])
+        >>> str(lst)
+        '[3 -> 2 -> 1 -> 10]'
+        """
+        node_class = self._node_class
+        it = iter(items)
+        for item in it:
+            first = node_class(item, self._first)
+            break
+        else:
+            return
+        if self._last is None:
+            self._last = first
+        count = 1
+        for count, item in enumerate(it, 2):
+            first = node_class(item, first)
+        old_first = self._first
+        self._first = first
+        self._size += count
+        if self._aggregates is not None:
+            self._aggregate_chain(first, old_first)
+
+    def _aggregate_chain(self, node: Optional[_Node],
+                         stop: Optional[_Node]) -> None:
+        """Add the items from <node> up to (but not including) <stop> to the
+        running aggregates.
+        """
+        aggregates = self._aggregates
+        while node is not stop:
+            aggregates.add(node.item)
+            node = node.next
 
     def __str__(self) -> str:
         """Return a string representation of this list in the form
@@ -63,6 +622,32 @@ class LinkedList:
             curr = curr.next
         return '[' + ' -> '.join(items) + ']'
 
+    def __iter__(self) -> Iterator:
+        """Return an iterator over the items in this list, in order.
+
+        >>> list(LinkedList([1, 2, 3]))
+        [1, 2, 3]
+        """
+        curr = self._first
+        while curr is not None:
+            yield curr.item
+            curr = curr.next
+
+    def cursor(self, index: int = 0) -> Cursor:
+        """Return a cursor positioned at <index> in this list.
+        Precondition: 0 <= index <= len(self)
+
+        A cursor positioned at len(self) is past the last item; it can still
+        be used to insert items at the end of the list.
+        >>> lst = LinkedList([1, 2, 3])
+        >>> cursor = lst.cursor(1)
+        >>> cursor.item
+        2
+        """
+        if index == 0:
+            return Cursor(self, None, 0)
+        return Cursor(self, self._node_at(index - 1), index)
+
     def __len__(self) -> int:
         """Return the number of elements in this list.
 
@@ -73,12 +658,126 @@ class LinkedList:
         >>> len(lst)
         3
         """
+        return self._size
+
+    def __getitem__(self, index: int) -> Any:
+        """Return the item at position <index> in this list.
+        Raise an IndexError if <index> is out of bounds.
+        >>> lst = LinkedList([1, 2, 3])
+        >>> lst[1]
+        2
+        >>> lst[-1]
+        3
+        """
+        return self._node_at(self._check_index(index)).item
+
+    def __setitem__(self, index: int, item: Any) -> None:
+        """Replace the item at position <index> in this list with <item>.
+        Raise an IndexError if <index> is out of bounds.
+        >>> lst = LinkedList([1, 2, 3])
+        >>> lst[0] = 100
+        >>> str(lst)
+        '[100 -> 2 -> 3]'
+        """
+        self._set_item(self._node_at(self._check_index(index)), item)
+
+    def _check_index(self, index: int) -> int:
+        """Return <index> as a non-negative position in this list, counting
+        negative indexes from the end.
+        Raise an IndexError if it is out of bounds.
+        """
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError
+        return index
+
+    def _node_at(self, index: int) -> _Node:
+        """Return the node at position <index>.
+        Precondition: 0 <= index < len(self)
+        """
+        if index == self._size - 1:
+            return self._last
         curr = self._first
-        count = 0
-        while curr is not None:
-            count += 1
+        for unused_ in range(index):
             curr = curr.next
-        return count
+        return curr
+
+    def _link(self, prev: Optional[_Node], node: _Node, index: int) -> None:
+        """Link <node> into this list immediately after <prev>, so that it
+        ends up at position <index>. If <prev> is None, <node> becomes the
+        first node.
+
+        All changes to the list's length go through this method and _unlink,
+        so subclasses can override them to keep extra state up to date.
+        """
+        if prev is None:
+            node.next = self._first
+            self._first = node
+        else:
+            node.next = prev.next
+            prev.next = node
+        if node.next is None:
+            self._last = node
+        self._size += 1
+        if self._aggregates is not None:
+            self._aggregates.add(node.item)
+
+    def _unlink(self, prev: Optional[_Node], index: int) -> _Node:
+        """Unlink and return the node immediately after <prev>, which is at
+        position <index>. If <prev> is None, unlink the first node.
+        """
+        if prev is None:
+            removed = self._first
+            self._first = removed.next
+        else:
+            removed = prev.next
+            prev.next = removed.next
+        if removed is self._last:
+            self._last = prev
+        self._size -= 1
+        if self._aggregates is not None:
+            self._aggregates.remove(removed.item)
+        return removed
+
+    def _split_after(self, prev: Optional[_Node], index: int) -> LinkedList:
+        """Remove the nodes after <prev>, the first of which is at position
+        <index>, and return them in a new linked list. If <prev> is None,
+        move every node into the new list.
+        """
+        new_lst = self._empty()
+        if prev is None:
+            new_lst._first = self._first
+            self._first = None
+        else:
+            new_lst._first = prev.next
+            prev.next = None
+        new_lst._last = self._last
+        new_lst._size = self._size - index
+        self._last = prev
+        self._size = index
+        if self._aggregates is not None:
+            new_lst.track_aggregates()
+            self._aggregates.unmerge(new_lst._aggregates)
+        return new_lst
+
+    def _set_item(self, node: _Node, item: Any) -> Any:
+        """Store <item> in <node>, which is in this list, and return the item
+        it replaced.
+        """
+        old, node.item = node.item, item
+        if self._aggregates is not None:
+            self._aggregates.remove(old)
+            self._aggregates.add(item)
+        return old
+
+    def _swap_items(self, i: int, j: int) -> None:
+        """Swap the items at positions <i> and <j>. This does not change the
+        aggregates, since the list holds the same items afterwards.
+        Precondition: 0 <= i, j < len(self)
+        """
+        node_i, node_j = self._node_at(i), self._node_at(j)
+        node_i.item, node_j.item = node_j.item, node_i.item
 
     def insert(self, index: int, item: Any) -> None:
         """Insert the given item at the given index in this list.
@@ -92,18 +791,12 @@ class LinkedList:
         >>> str(linky)
         '[0 -> 1 -> 2 -> 2.5 -> 3 -> 4]'
         """
-        new_node = _Node(item)
         if index == 0:
-            new_node.next = self._first  #
-            self._first = new_node
+            prev = None
         else:
-            cur = self._first
-            i = 0
-            while cur is not None and i < index - 1:
-                cur = cur.next
-                i += 1
-            new_node.next = cur.next
-            cur.next = new_node  #
+            # When appending, this is the last node and no walk is needed.
+            prev = self._node_at(index - 1)
+        self._link(prev, self._node_class(item), index)
 
     def pop(self, index: int) -> Any:
         """Remove and return the item at position <index>.
@@ -118,19 +811,244 @@ class LinkedList:
         """
         # pop the first node
         if index == 0:
-            removed = self._first
-            self._first = self._first.next
-            return removed.item
+            return self._unlink(None, 0).item
         # pop another node
         else:
-            cur = self._first
-            i = 0
-            while i < index - 1:
-                cur = cur.next
-                i += 1
-            removed = cur.next
-            cur.next = cur.next.next
-            return removed.item
+            return self._unlink(self._node_at(index - 1), index).item
+
+    def apply_batch(self, ops: Iterable[tuple]) -> List[Any]:
+        """Apply a sequence of insert and pop operations to this list, and
+        return the popped items in order.
+
+        Each operation is either ('insert', index, item) or ('pop', index),
+        and its index refers to the list as left by the operations before
+        it, exactly as if insert and pop were called one at a time. Raise an
+        IndexError, without changing the list, if any index is out of range.
+
+        The operations are first resolved into a plan of which original runs
+        of nodes survive and where new items go, and then the list is rebuilt
+        from that plan in a single forward traversal. For n items and m
+        operations this takes O(n + m log m) time rather than O(n * m).
+        >>> lst = LinkedList([1, 2, 3, 4])
+        >>> lst.apply_batch([('insert', 4, 5), ('pop', 0), ('insert', 1, 2.5)])
+        [1]
+        >>> str(lst)
+        '[2 -> 2.5 -> 3 -> 4 -> 5]'
+
+        The result always matches applying the operations one at a time:
+        >>> rng = random.Random(148)
+        >>> for trial in range(300):
+        ...     n = rng.randrange(8)
+        ...     batch, step = LinkedList(range(n)), LinkedList(range(n))
+        ...     ops = []
+        ...     for unused_ in range(rng.randrange(12)):
+        ...         if n > 0 and rng.random() < 0.5:
+        ...             ops.append(('pop', rng.randrange(n)))
+        ...             n -= 1
+        ...         else:
+        ...             ops.append(('insert', rng.randrange(n + 1), -len(ops)))
+        ...             n += 1
+        ...     popped = [step.pop(op[1]) if op[0] == 'pop'
+        ...               else step.insert(op[1], op[2]) for op in ops]
+        ...     expected = [item for item in popped if item is not None]
+        ...     assert batch.apply_batch(ops) == expected
+        ...     assert list(batch) == list(step) and len(batch) == len(step)
+
+        A few thousand operations on a long list stay fast:
+        >>> lst = LinkedList(range(100000))
+        >>> ops = [('pop', rng.randrange(100000 - i)) for i in range(3000)]
+        >>> ops += [('insert', rng.randrange(97000), i) for i in range(3000)]
+        >>> len(lst.apply_batch(ops)), len(lst)
+        (3000, 100000)
+        """
+        # Plan the batch on a treap of runs, without touching any node.
+        root = None if self._size == 0 else _Piece(0, self._size)
+        popped = []
+        for op in ops:
+            size = 0 if root is None else root.size
+            if op[0] == 'insert':
+                if not 0 <= op[1] <= size:
+                    raise IndexError
+                before, after = _split_pieces(root, op[1])
+                new_piece = _Piece(-1, 1, op[2])
+                root = _merge_pieces(_merge_pieces(before, new_piece), after)
+            elif op[0] == 'pop':
+                if not 0 <= op[1] < size:
+                    raise IndexError
+                before, rest = _split_pieces(root, op[1])
+                removed, after = _split_pieces(rest, 1)
+                root = _merge_pieces(before, after)
+                popped.append(removed)
+            else:
+                raise ValueError(f'unknown operation {op[0]!r}')
+        pieces = _in_order(root)
+
+        # Find every original node the plan refers to in one forward walk.
+        wanted = set()
+        for piece in pieces + popped:
+            if piece.start != -1:
+                wanted.add(piece.start)
+                wanted.add(piece.start + piece.length - 1)
+        nodes = {}
+        if self._size > 0:
+            nodes[self._size - 1] = self._last
+        wanted.discard(self._size - 1)
+        curr = self._first
+        index = 0
+        for target in sorted(wanted):
+            while index < target:
+                curr = curr.next
+                index += 1
+            nodes[target] = curr
+
+        # Relink the surviving runs and the new nodes in their final order.
+        self._first = None
+        prev = None
+        for piece in pieces:
+            if piece.start == -1:
+                head = tail = self._node_class(piece.item)
+            else:
+                head = nodes[piece.start]
+                tail = nodes[piece.start + piece.length - 1]
+            if prev is None:
+                self._first = head
+            else:
+                prev.next = head
+            prev = tail
+        if prev is not None:
+            prev.next = None
+        self._last = prev
+        self._size = 0 if root is None else root.size
+        if self._aggregates is not None:
+            # Items that were inserted and then popped in this batch were
+            # never counted, so only original items need to be removed.
+            for piece in popped:
+                if piece.start != -1:
+                    self._aggregates.remove(nodes[piece.start].item)
+            for piece in pieces:
+                if piece.start == -1:
+                    self._aggregates.add(piece.item)
+        return [piece.item if piece.start == -1 else nodes[piece.start].item
+                for piece in popped]
+
+    def sort(self, key: Optional[Callable[[Any], Any]] = None,
+             reverse: bool = False) -> None:
+        """Sort the items in this list in place, in the same order as
+        sorted(self, key=key, reverse=reverse).
+
+        This is a stable bottom-up natural merge sort: each pass finds the
+        runs that are already in order and merges them in pairs, only
+        relinking the existing nodes. It creates no nodes, uses O(1) extra
+        memory, and takes a single pass over a list that is already sorted.
+        Keys are recomputed as needed rather than stored.
+
+        Like list.sort, if key() or a comparison raises an error, the error
+        is passed on and every item is still in the list, in some order.
+        >>> lst = LinkedList([3, 1, 2, 1])
+        >>> lst.sort()
+        >>> str(lst)
+        '[1 -> 1 -> 2 -> 3]'
+        >>> lst = LinkedList(['bb', 'a', 'cc', 'd'])
+        >>> lst.sort(key=len, reverse=True)
+        >>> str(lst)
+        '[bb -> cc -> a -> d]'
+        >>> lst = LinkedList([(1, 'a'), (2, 0), (1, 0)])
+        >>> lst.sort()
+        Traceback (most recent call last):
+        TypeError: '<' not supported between instances of 'int' and 'str'
+        >>> len(lst), sorted(lst, key=str), lst[len(lst) - 1] is lst._last.item
+        (3, [(1, 'a'), (1, 0), (2, 0)], True)
+        """
+        if self._size < 2:
+            return
+        if key is None:
+            def key(item: Any) -> Any:
+                return item
+        # precedes(k1, k2) is True iff an item with key k1 must come before
+        # one with key k2; equal keys keep their relative order.
+        precedes = gt if reverse else lt
+
+        # The merged runs are linked in after this sentinel node, which
+        # stands in for the node before the first one.
+        sentinel = _Node(None, self._first)
+        runs = 0
+        try:
+            while runs != 1:
+                head, tail, runs = sentinel.next, sentinel, 0
+                while head is not None:
+                    end = self._run_end(head, key, precedes)
+                    if end.next is not None:
+                        second = end.next
+                        second_end = self._run_end(second, key, precedes)
+                        end = self._merge_runs(tail, head, end, second,
+                                               second_end, key, precedes)
+                    tail, head = end, end.next
+                    runs += 1
+                self._first = sentinel.next
+                self._last = tail
+        except BaseException:
+            self._first = self._last = sentinel.next
+            while self._last.next is not None:
+                self._last = self._last.next
+            raise
+
+    @staticmethod
+    def _run_end(node: _Node, key: Callable[[Any], Any],
+                 precedes: Callable[[Any, Any], bool]) -> _Node:
+        """Return the last node of the run starting at <node>: the longest
+        chain of nodes that is already in sorted order.
+        """
+        node_key = key(node.item)
+        while node.next is not None:
+            next_key = key(node.next.item)
+            if precedes(next_key, node_key):
+                break
+            node, node_key = node.next, next_key
+        return node
+
+    @staticmethod
+    def _merge_runs(tail: _Node, a: _Node, a_end: _Node, b: _Node,
+                    b_end: _Node, key: Callable[[Any], Any],
+                    precedes: Callable[[Any, Any], bool]) -> _Node:
+        """Merge the sorted run from <a> to <a_end> with the sorted run from
+        <b> to <b_end>, which follows it, linking the merged run in after
+        <tail>, and return the last node of the merged run. Its next
+        reference is left pointing to whatever followed <b_end>.
+
+        If key() or a comparison raises an error, the nodes of <a> and <b>
+        not merged yet are linked back in after the merged ones, in their
+        original order, and the error is re-raised, so no node is lost.
+        """
+        following = b_end.next
+        a_end.next = b_end.next = None
+        try:
+            a_key, b_key = key(a.item), key(b.item)
+            while a is not None and b is not None:
+                if precedes(b_key, a_key):
+                    tail.next = tail = b
+                    b = b.next
+                    if b is not None:
+                        b_key = key(b.item)
+                else:
+                    tail.next = tail = a
+                    a = a.next
+                    if a is not None:
+                        a_key = key(a.item)
+        except BaseException:
+            for rest, rest_end in [(a, a_end), (b, b_end)]:
+                if rest is not None:
+                    tail.next = rest
+                    tail = rest_end
+            tail.next = following
+            raise
+        if a is not None:
+            tail.next = a
+            tail = a_end
+        else:
+            tail.next = b
+            tail = b_end
+        tail.next = following
+        return tail
 
     def reverse_nodes(self, i: int) -> None:
         """Reverse the nodes at index i and i + 1 by changing their next references
@@ -157,13 +1075,14 @@ class LinkedList:
             temp.next = self._first.next
             self._first.next = temp
         else:
-            curr = self._first
-            for unused_ in range(i - 1):
-                curr = curr.next
+            curr = self._node_at(i - 1)
             temp = curr.next
             curr.next = curr.next.next
             temp.next = curr.next.next
             curr.next.next = temp
+        # The node that was at index i is now at index i + 1.
+        if temp.next is None:
+            self._last = temp
 
     def swap_halves(self) -> None:
         """Move the nodes in the second half of this list to the front.
@@ -187,21 +1106,16 @@ class LinkedList:
         mid_index = len(self) // 2
 
         # Set first_end to refer to the node at the end of the first half
-        first_end = self._first
-        pos = 0
-        while pos < mid_index - 1:
-            first_end = first_end.next
-            pos += 1
+        first_end = self._node_at(mid_index - 1)
 
-        # Set second_end to refer to the node at the end of the second half
-        second_end = first_end.next
-        while second_end.next is not None:
-            second_end = second_end.next
+        # The end of the second half is the tail, which we already know.
+        second_end = self._last
 
         # Swap the halves
         second_end.next = self._first
         self._first = first_end.next
         first_end.next = None
+        self._last = first_end
 
     def average(self) -> float:
         """Return the average of the numbers in this linked list.
@@ -212,6 +1126,12 @@ class LinkedList:
         >>> lst.average()
         12.5
         """
+        if self._aggregates is not None:
+            return self._aggregates.mean()
+        values = self._gather()
+        if values is not None:
+            return float(values.mean())
+
         curr = self._first
         counter = 0
         accumulator = 0
@@ -223,6 +1143,76 @@ class LinkedList:
 
         return accumulator / counter
 
+    def variance(self) -> float:
+        """Return the population variance of the numbers in this linked list.
+        Preconditions:
+        - this linked list is not empty
+        - all items in this linked list are numbers
+        >>> LinkedList([2, 4, 4, 4, 5, 5, 7, 9]).variance()
+        4.0
+        """
+        if self._aggregates is not None:
+            return self._aggregates.variance()
+        values = self._gather()
+        if values is not None:
+            return float(values.var())
+        mean = self.average()
+        return sum((item - mean) ** 2 for item in self) / self._size
+
+    def minimum(self) -> Any:
+        """Return the smallest item in this linked list.
+        Precondition: this linked list is not empty.
+        >>> LinkedList([3, 1, 2]).minimum()
+        1
+        """
+        if self._aggregates is None:
+            return min(self)
+        if self._aggregates.stale:
+            self._refresh_extremes()
+        return self._aggregates.minimum
+
+    def maximum(self) -> Any:
+        """Return the largest item in this linked list.
+        Precondition: this linked list is not empty.
+        >>> LinkedList([3, 1, 2]).maximum()
+        3
+        """
+        if self._aggregates is None:
+            return max(self)
+        if self._aggregates.stale:
+            self._refresh_extremes()
+        return self._aggregates.maximum
+
+    def _refresh_extremes(self) -> None:
+        """Recompute the minimum and maximum in the running aggregates.
+        """
+        self._aggregates.minimum = min(self)
+        self._aggregates.maximum = max(self)
+        self._aggregates.stale = False
+
+    def _gather(self) -> Optional[Any]:
+        """Return the items of this list as a NumPy float array, for
+        reducing in a single vectorized pass. Return None if NumPy is not
+        installed, or if any item is not exactly a float or an int that a
+        float holds exactly: other numbers, such as Fractions and Decimals,
+        must be reduced in their own arithmetic. Return None too if this list
+        is empty, so that reducing it fails as it would without NumPy.
+        >>> from fractions import Fraction
+        >>> LinkedList([Fraction(1, 3), Fraction(1, 6)]).average()
+        Fraction(1, 4)
+        >>> LinkedList([]).average()
+        Traceback (most recent call last):
+        ...
+        ZeroDivisionError: division by zero
+        """
+        if numpy is None or self._size == 0:
+            return None
+        for item in self:
+            if not (type(item) is float or type(item) is int
+                    and -(1 << 53) <= item <= (1 << 53)):
+                return None
+        return numpy.fromiter(self, dtype=float, count=self._size)
+
     def intersperse(self, other: LinkedList) -> None:
         """Insert the items of <other> in between the items of this linked list.
         Each item in <other> is inserted immediately after the corresponding item in <self>.
@@ -235,20 +1225,12 @@ class LinkedList:
         '[1 -> 2 -> 3]'
         >>> lst1.intersperse(lst2)
         >>> str(lst1) # after
-        '[1 -> 10 -> 2 -> 20 -> 3 -> 30]
+        '[1 -> 10 -> 2 -> 20 -> 3 -> 30]'
         """
-        curr1 = self._first
-        curr2 = other._first
-
-        # NOTE: You should do all of your work *inside* the while loop.
-        # It is up to you to complete the while loop condition and its body.
-
-        while curr1 is not None:
-            new_node = _Node(curr2.item)
-            new_node.next = curr1.next
-            curr1.next = new_node
-            curr1 = curr1.next.next
-            curr2 = curr2.next
+        cursor = self.cursor()
+        for item in other:
+            cursor.insert_after(item)
+            cursor.advance(2)
 
     def bisect(self, i: int) -> LinkedList:
         """Remove from this linked list the nodes at position i and beyond,
@@ -273,23 +1255,9 @@ class LinkedList:
         >>> str(linky2)
         '[1]'
         """
-        if i < 0 or i >= self.__len__():
+        if i < 0 or i >= self._size:
             raise IndexError
-        elif i == 0:
-            l = LinkedList([])
-            l._first = self._first
-            self._first = None
-            return l
-        else:
-            index = 0
-            curr = self._first
-            while index < i - 1:
-                curr = curr.next
-                index += 1
-            new_lst = LinkedList([])
-            new_lst._first = curr.next
-            curr.next = None
-            return new_lst
+        return self.cursor(i).split_here()
 
     def do_stuff(self) -> None:
         """
@@ -298,13 +1266,13 @@ class LinkedList:
         >>> str(lst)
         '[1 -> 2 -> 10 -> 3 -> 5 -> 10 -> 6 -> 8]'
         """
-        prev = self._first
-        curr = self._first.next
-        while curr is not None:
+        prev = self.cursor(0)
+        curr = self.cursor(1)
+        while not curr.at_end:
             if curr.item >= 10:
-                curr.item, prev.item = prev.item, curr.item
-            prev = curr
-            curr = curr.next
+                curr.swap(prev)
+            prev.advance()
+            curr.advance()
 
     def insert_linked_list(self, other: LinkedList, pos: int) -> None:
         """Insert <other> into this linked list immediately before position
@@ -321,23 +1289,28 @@ class LinkedList:
         '[99 -> 0 -> 1 -> 2 -> 3 -> 10 -> 11 -> 12 -> 4 -> 5]'
         """
 
+        if self._aggregates is not None:
+            # This must be done before <other>'s nodes are linked in.
+            if other._aggregates is not None:
+                self._aggregates.merge(other._aggregates)
+            else:
+                self._aggregates.merge(_Aggregates(other))
+
+        # <other> keeps track of its last node, so no walk is needed to find it.
+        last = other._last
         if pos == 0:
-            last = other._first
-            while last.next is not None:
-                last = last.next
             last.next = self._first
             self._first = other._first
+            if self._last is None:
+                self._last = last
         else:
-            curr = self._first
-            for i in range(pos - 1):
-                curr = curr.next
-
-            last = other._first
-            while last.next is not None:
-                last = last.next
+            curr = self._node_at(pos - 1)
 
             last.next = curr.next
             curr.next = other._first
+            if curr is self._last:
+                self._last = last
+        self._size += other._size
 
 
 def swap(lst: LinkedList, i: int, j: int) -> None:
@@ -351,43 +1324,1986 @@ def swap(lst: LinkedList, i: int, j: int) -> None:
         >>> str(linky)
         '[40 -> 20 -> 30 -> 10 -> 50]'
         """
-    index_i = 0
-    curr_i = lst._first
-    while index_i < i:
-        if curr_i is not None:
-            curr_i = curr_i.next
-            index_i += 1
-        else:
+    # The length is known up front, so bad indexes fail before any walking.
+    if i >= len(lst) or j >= len(lst):
+        raise IndexError
+
+    lst._swap_items(i, j)
+
+
+class Cursor:
+    """A position in a LinkedList, for making a sequence of edits in
+    amortized constant time each.
+
+    A cursor is either on a node, or at the end of the list (after the last
+    node). Edits made through the cursor keep the list consistent, but any
+    other change to the list's structure invalidates the cursor.
+
+    >>> lst = LinkedList([1, 2, 3])
+    >>> cursor = lst.cursor()
+    >>> cursor.insert_before(0)
+    >>> cursor.advance()
+    >>> cursor.remove()
+    2
+    >>> cursor.insert_after(4)
+    >>> cursor.replace(30)
+    3
+    >>> str(lst)
+    '[0 -> 1 -> 30 -> 4]'
+    >>> str(cursor.split_here())
+    '[30 -> 4]'
+    >>> str(lst)
+    '[0 -> 1]'
+    """
+    # === Private Attributes ===
+    # _lst:
+    #     The list this cursor moves through.
+    # _prev:
+    #     The node just before the cursor's position, or None if the cursor
+    #     is at the front of the list.
+    # _index:
+    #     The cursor's position in the list.
+    _lst: LinkedList
+    _prev: Optional[_Node]
+    _index: int
+
+    def __init__(self, lst: LinkedList, prev: Optional[_Node],
+                 index: int) -> None:
+        """Initialize a new cursor on <lst> at position <index>, just after
+        <prev>.
+        """
+        self._lst = lst
+        self._prev = prev
+        self._index = index
+
+    def _node(self) -> Optional[_Node]:
+        """Return the node at the cursor's position, or None if the cursor
+        is at the end of the list.
+        """
+        if self._prev is None:
+            return self._lst._first
+        return self._prev.next
+
+    @property
+    def index(self) -> int:
+        """The cursor's position in its list."""
+        return self._index
+
+    @property
+    def at_end(self) -> bool:
+        """Whether the cursor is past the last item in its list."""
+        return self._node() is None
+
+    @property
+    def item(self) -> Any:
+        """The item at the cursor's position.
+        Raise an IndexError if the cursor is at the end of the list.
+        """
+        node = self._node()
+        if node is None:
             raise IndexError
+        return node.item
 
-    index_j = 0
-    curr_j = lst._first
-    while index_j < j:
-        if curr_j is not None:
-            curr_j = curr_j.next
-            index_j += 1
-        else:
+    def advance(self, steps: int = 1) -> None:
+        """Move the cursor <steps> positions forward.
+        Raise an IndexError if that would move it past the end of the list.
+        """
+        for unused_ in range(steps):
+            node = self._node()
+            if node is None:
+                raise IndexError
+            self._prev = node
+            self._index += 1
+
+    def insert_before(self, item: Any) -> None:
+        """Insert <item> at the cursor's position. The cursor stays on the
+        same node, which is now one position further along.
+        """
+        node = self._lst._node_class(item)
+        self._lst._link(self._prev, node, self._index)
+        self._prev = node
+        self._index += 1
+
+    def insert_after(self, item: Any) -> None:
+        """Insert <item> just after the cursor's position. The cursor does
+        not move.
+        Raise an IndexError if the cursor is at the end of the list.
+        """
+        node = self._node()
+        if node is None:
+            raise IndexError
+        self._lst._link(node, self._lst._node_class(item), self._index + 1)
+
+    def remove(self) -> Any:
+        """Remove and return the item at the cursor's position. The cursor
+        moves onto the following node, if any.
+        Raise an IndexError if the cursor is at the end of the list.
+        """
+        if self._node() is None:
+            raise IndexError
+        return self._lst._unlink(self._prev, self._index).item
+
+    def replace(self, item: Any) -> Any:
+        """Replace the item at the cursor's position with <item>, and return
+        the item it replaced.
+        Raise an IndexError if the cursor is at the end of the list.
+        """
+        node = self._node()
+        if node is None:
+            raise IndexError
+        return self._lst._set_item(node, item)
+
+    def swap(self, other: Cursor) -> None:
+        """Swap the item at this cursor's position with the item at the
+        position of <other>, a cursor on the same list.
+        Raise an IndexError if either cursor is at the end of the list.
+        """
+        node, other_node = self._node(), other._node()
+        if node is None or other_node is None:
             raise IndexError
+        node.item, other_node.item = other_node.item, node.item
 
-    curr_j.item, curr_i.item = curr_i.item, curr_j.item
+    def split_here(self) -> LinkedList:
+        """Remove the items from the cursor's position onward, and return
+        them in a new linked list. The cursor is left at the end of the list.
+        """
+        return self._lst._split_after(self._prev, self._index)
 
 
 class HoppingLinkedList(LinkedList):
-    _refs: List[_Node]
+    """A linked list that keeps references to nodes spread roughly k apart,
+    so that positional access walks from the nearest reference instead of
+    from the front of the list.
+
+    Accessing or mutating the list at an index costs O(log(n/k) + k) to find
+    the node plus O(n/k) to repair the references after a mutation. If
+    <auto_k> is True, k is retuned to about sqrt(len(self)) as the list grows
+    and shrinks.
+    """
+    # === Private Attributes ===
+    # _refs:
+    #     References to distinct nodes in this list, in order. _refs[0] is
+    #     always the first node, and consecutive references are roughly _k
+    #     nodes apart; mutations repair any gap that grows past 2 * _k.
+    #     This is None while a bulk operation rewrites the list, after which
+    #     the references are rebuilt.
+    # _ref_pos:
+    #     _ref_pos[j] is the index of the node _refs[j].
+    # _k:
+    #     The target number of nodes between consecutive references.
+    # _auto_k:
+    #     Whether _k is retuned to about sqrt(len(self)) as the list changes.
+    _refs: Optional[List[_Node]]
+    _ref_pos: List[int]
     _k: int
+    _auto_k: bool
 
-    def __init__(self, k, items: list):
-        LinkedList.__init__(self, items)
+    def __init__(self, k: int, items: Iterable = (), auto_k: bool = False,
+                 aggregates: bool = False) -> None:
+        """Initialize a new hopping linked list containing the given items,
+        with references to every k-th node.
+        Precondition: k >= 1
+
+        >>> lst = HoppingLinkedList(2, [1, 2, 3, 4, 5])
+        >>> lst[3]
+        4
+        >>> lst.insert(1, 10)
+        >>> lst.pop(4)
+        4
+        >>> str(lst)
+        '[1 -> 10 -> 2 -> 3 -> 5]'
+        """
         self._k = k
-        self._refs = [self._first]
-        curr = self._first
-        counter = 0
-        while curr is not None:
-            if counter % k == 0:
-                self._refs.append(curr.next)
-            counter += 1
-            curr = curr.next
+        self._auto_k = auto_k
+        self._refs = []
+        self._ref_pos = []
+        LinkedList.__init__(self, items, aggregates)
 
+    @classmethod
+    def from_iterable(cls, items: Iterable,
+                      k: Optional[int] = None) -> HoppingLinkedList:
+        """Return a new hopping linked list containing the items of <items>,
+        with references to every k-th node, or if <k> is None, with k tuned
+        automatically to about sqrt(len(self)).
 
+        >>> lst = HoppingLinkedList.from_iterable(range(10000))
+        >>> lst._k, lst[9999]
+        (100, 9999)
+        """
+        if k is None:
+            return cls(2, items, auto_k=True)
+        return cls(k, items)
+
+    def __reduce__(self) -> tuple:
+        """Return the information pickle needs to rebuild this list, passing
+        the items as an iterator as in LinkedList.
+
+        >>> lst = HoppingLinkedList(2, [1, 2, 3], aggregates=True)
+        >>> pickle.loads(pickle.dumps(lst))._aggregates is not None
+        True
+        """
+        return (self.__class__,
+                (self._k, (), self._auto_k, self._aggregates is not None),
+                None, iter(self))
+
+    def _rebuild_refs(self) -> None:
+        """Recompute the references from scratch, one every _k nodes.
+        """
+        if self._auto_k:
+            self._k = max(2, isqrt(self._size))
+        self._refs = []
+        self._ref_pos = []
+        curr = self._first
+        index = 0
+        while curr is not None:
+            if index % self._k == 0:
+                self._refs.append(curr)
+                self._ref_pos.append(index)
+            curr = curr.next
+            index += 1
+
+    def extend(self, items: Iterable) -> None:
+        """Add the items of <items> to the end of this list, adding
+        references through the new nodes.
+
+        >>> lst = HoppingLinkedList(2, [1, 2, 3])
+        >>> lst.extend(iter([4, 5, 6]))
+        >>> lst._ref_pos
+        [0, 2, 4]
+        """
+        old_size, old_last = self._size, self._last
+        LinkedList.extend(self, items)
+        if self._retune():
+            return
+        if old_size == 0:
+            self._rebuild_refs()
+            return
+        last_pos = self._ref_pos[-1]
+        curr = old_last.next
+        index = old_size
+        while curr is not None:
+            if index - last_pos >= self._k:
+                self._refs.append(curr)
+                self._ref_pos.append(index)
+                last_pos = index
+            curr = curr.next
+            index += 1
+
+    def extendleft(self, items: Iterable) -> None:
+        """Add the items of <items> to the front of this list, in reverse
+        order, shifting the existing references and adding new ones through
+        the new nodes.
+        """
+        old_size = self._size
+        LinkedList.extendleft(self, items)
+        m = self._size - old_size
+        if m == 0:
+            return
+        if self._retune():
+            return
+        if old_size == 0:
+            self._rebuild_refs()
+            return
+        self._shift_refs(0, m)
+        new_refs, new_pos = [], []
+        curr = self._first
+        for index in range(0, m, self._k):
+            new_refs.append(curr)
+            new_pos.append(index)
+            for unused_ in range(min(self._k, m - index)):
+                curr = curr.next
+        self._refs[0:0] = new_refs
+        self._ref_pos[0:0] = new_pos
+        self._repair_gap(m - 1)
+
+    def _node_at(self, index: int) -> _Node:
+        """Return the node at position <index>, starting the walk from the
+        closest reference at or before it.
+        Precondition: 0 <= index < len(self)
+        """
+        if index == self._size - 1:
+            return self._last
+        if self._refs is None:
+            return LinkedList._node_at(self, index)
+        j = bisect_right(self._ref_pos, index) - 1
+        curr = self._refs[j]
+        for unused_ in range(index - self._ref_pos[j]):
+            curr = curr.next
+        return curr
+
+    def _shift_refs(self, start: int, delta: int) -> None:
+        """Add <delta> to the position of every reference from _refs[start]
+        onward.
+        """
+        ref_pos = self._ref_pos
+        for j in range(start, len(ref_pos)):
+            ref_pos[j] += delta
+
+    def _repair_gap(self, index: int) -> None:
+        """Restore the spacing of the references around position <index>.
+
+        Gaps on either side of <index> that have shrunk below _k // 2 are
+        merged into their neighbours, and a gap that has grown beyond 2 * _k
+        is split in two.
+        """
+        refs, ref_pos, k = self._refs, self._ref_pos, self._k
+        min_gap = max(1, k // 2)
+        j = bisect_right(ref_pos, index) - 1
+        if j > 0 and ref_pos[j] - ref_pos[j - 1] < min_gap:
+            del refs[j]
+            del ref_pos[j]
+            j -= 1
+        if j + 1 < len(refs) and ref_pos[j + 1] - ref_pos[j] < min_gap:
+            del refs[j + 1]
+            del ref_pos[j + 1]
+        if j + 1 < len(refs):
+            gap = ref_pos[j + 1] - ref_pos[j]
+        else:
+            gap = self._size - ref_pos[j]
+        if gap > 2 * k:
+            curr = refs[j]
+            for unused_ in range(k):
+                curr = curr.next
+            refs.insert(j + 1, curr)
+            ref_pos.insert(j + 1, ref_pos[j] + k)
+
+    def _retune(self) -> bool:
+        """If auto-tuning is on and _k has drifted far from sqrt(len(self)),
+        rebuild the references with a new _k. Return whether a rebuild
+        happened.
+        """
+        if self._auto_k and (4 * self._k * self._k < self._size
+                             or self._size < self._k * self._k // 4):
+            self._rebuild_refs()
+            return True
+        return False
+
+    def _link(self, prev: Optional[_Node], node: _Node, index: int) -> None:
+        LinkedList._link(self, prev, node, index)
+        if self._refs is None or self._retune():
+            return
+        if self._size == 1:
+            self._refs = [node]
+            self._ref_pos = [0]
+            return
+        j = bisect_left(self._ref_pos, index)
+        self._shift_refs(j, 1)
+        if index == 0:
+            # The first node must always be referenced.
+            self._refs[0] = node
+            self._ref_pos[0] = 0
+        self._repair_gap(index)
+
+    def _unlink(self, prev: Optional[_Node], index: int) -> _Node:
+        removed = LinkedList._unlink(self, prev, index)
+        if self._refs is None or self._retune():
+            return removed
+        if self._size == 0:
+            self._refs = []
+            self._ref_pos = []
+            return removed
+        refs, ref_pos = self._refs, self._ref_pos
+        j = bisect_left(ref_pos, index)
+        if j < len(refs) and ref_pos[j] == index:
+            if removed.next is None:
+                # The removed node was the last one, and had its own reference.
+                del refs[j]
+                del ref_pos[j]
+            else:
+                # Its successor moves into its position and takes its reference.
+                refs[j] = removed.next
+                j += 1
+        self._shift_refs(j, -1)
+        self._repair_gap(min(index, self._size - 1))
+        return removed
+
+    def _split_after(self, prev: Optional[_Node], index: int) -> LinkedList:
+        new_lst = LinkedList._split_after(self, prev, index)
+        j = bisect_left(self._ref_pos, index)
+        del self._refs[j:]
+        del self._ref_pos[j:]
+        self._retune()
+        return new_lst
+
+    def reverse_nodes(self, i: int) -> None:
+        """Reverse the nodes at index i and i + 1, as in LinkedList.
+
+        Only references to those two nodes need to change.
+        >>> lst = HoppingLinkedList(1, [5, 10, 15])
+        >>> lst.reverse_nodes(0)
+        >>> lst[0], lst[1]
+        (10, 5)
+        """
+        a = self._node_at(i)
+        b = a.next
+        LinkedList.reverse_nodes(self, i)
+        j = bisect_left(self._ref_pos, i)
+        while j < len(self._refs) and self._ref_pos[j] <= i + 1:
+            self._refs[j] = b if self._refs[j] is a else a
+            j += 1
+
+    def swap_halves(self) -> None:
+        """Move the nodes in the second half of this list to the front, as in
+        LinkedList, rotating the references along with them.
+        >>> lst = HoppingLinkedList(2, [5, 10, 15, 20, 25])
+        >>> lst.swap_halves()
+        >>> lst[0], lst[4]
+        (15, 10)
+        """
+        n, mid_index = self._size, self._size // 2
+        LinkedList.swap_halves(self)
+        refs, ref_pos = self._refs, self._ref_pos
+        j = bisect_left(ref_pos, mid_index)
+        self._refs = refs[j:] + refs[:j]
+        self._ref_pos = ([pos - mid_index for pos in ref_pos[j:]]
+                         + [pos + n - mid_index for pos in ref_pos[:j]])
+        if not self._ref_pos or self._ref_pos[0] != 0:
+            self._refs.insert(0, self._first)
+            self._ref_pos.insert(0, 0)
+
+    def intersperse(self, other: LinkedList) -> None:
+        """Insert the items of <other> in between the items of this linked
+        list, as in LinkedList.
+        Every position changes, so the references are rebuilt once at the
+        end rather than repaired after each insertion.
+        """
+        self._refs = None
+        LinkedList.intersperse(self, other)
+        self._rebuild_refs()
+
+    def apply_batch(self, ops: Iterable[tuple]) -> List[Any]:
+        """Apply a sequence of insert and pop operations to this list, as in
+        LinkedList, and rebuild the references once at the end.
+        """
+        popped = LinkedList.apply_batch(self, ops)
+        self._rebuild_refs()
+        return popped
+
+    def sort(self, key: Optional[Callable[[Any], Any]] = None,
+             reverse: bool = False) -> None:
+        """Sort the items in this list in place, as in LinkedList, and
+        rebuild the references once at the end.
+        """
+        try:
+            LinkedList.sort(self, key, reverse)
+        finally:
+            self._rebuild_refs()
+
+    def insert_linked_list(self, other: LinkedList, pos: int) -> None:
+        """Insert <other> into this linked list immediately before position
+        pos, as in LinkedList.
+
+        References after <pos> are shifted, and new references are added
+        every _k nodes through the spliced-in nodes.
+        >>> lst = HoppingLinkedList(2, [0, 1, 2, 3])
+        >>> lst.insert_linked_list(HoppingLinkedList(2, [10, 11, 12]), 1)
+        >>> [lst[i] for i in range(len(lst))]
+        [0, 10, 11, 12, 1, 2, 3]
+        """
+        m = other._size
+        LinkedList.insert_linked_list(self, other, pos)
+        if self._retune():
+            return
+        j = bisect_left(self._ref_pos, pos)
+        self._shift_refs(j, m)
+        new_refs, new_pos = [], []
+        curr = other._first
+        for offset in range(m):
+            if offset % self._k == 0:
+                new_refs.append(curr)
+                new_pos.append(pos + offset)
+            curr = curr.next
+        self._refs[j:j] = new_refs
+        self._ref_pos[j:j] = new_pos
+        self._repair_gap(pos + m - 1)
+
+
+class DoublyLinkedList(LinkedList):
+    """A linked list whose nodes also refer to the node before them.
+
+    Adding or removing items at either end takes constant time, and every
+    positional walk starts from whichever end of the list is closer.
+
+    >>> queue = DoublyLinkedList([2, 3])
+    >>> queue.appendleft(1)
+    >>> queue.append(4)
+    >>> queue.pop(), queue.popleft()
+    (4, 1)
+    >>> str(queue)
+    '[2 -> 3]'
+    """
+    _first: Optional[_DoublyNode]
+    _last: Optional[_DoublyNode]
+
+    _node_class = _DoublyNode
+
+    def _empty(self) -> DoublyLinkedList:
+        """Return a new empty list to hold nodes split off from this one.
+        """
+        return DoublyLinkedList()
+
+    @staticmethod
+    def _relink_prev(prev: Optional[_DoublyNode], node: Optional[_DoublyNode],
+                     stop: Optional[_DoublyNode] = None) -> None:
+        """Set the prev references of the nodes from <node> up to and
+        including <stop> (or to the end of the list), following their next
+        references. <prev> is the node before <node>.
+        """
+        while node is not None:
+            node.prev = prev
+            if node is stop:
+                return
+            prev, node = node, node.next
+
+    def appendleft(self, item: Any) -> None:
+        """Add <item> to the front of this list, in constant time.
+        """
+        self._link(None, self._node_class(item), 0)
+
+    def pop(self, index: Optional[int] = None) -> Any:
+        """Remove and return the item at position <index>, or the last item
+        if <index> is None, walking from whichever end is closer.
+        Precondition: 0 <= index < len(self)
+
+        >>> lst = DoublyLinkedList([1, 2, 10, 200])
+        >>> lst.pop()
+        200
+        >>> lst.pop(1)
+        2
+        """
+        if index is None:
+            index = self._size - 1
+        node = self._node_at(index)
+        return self._unlink(node.prev, index).item
+
+    def popleft(self) -> Any:
+        """Remove and return the first item in this list, in constant time.
+        Precondition: this list is not empty.
+        """
+        return self._unlink(None, 0).item
+
+    def _node_at(self, index: int) -> _DoublyNode:
+        """Return the node at position <index>, walking from whichever end of
+        the list is closer.
+        Precondition: 0 <= index < len(self)
+        """
+        if index <= self._size // 2:
+            return LinkedList._node_at(self, index)
+        curr = self._last
+        for unused_ in range(self._size - 1 - index):
+            curr = curr.prev
+        return curr
+
+    def _link(self, prev: Optional[_DoublyNode], node: _DoublyNode,
+              index: int) -> None:
+        LinkedList._link(self, prev, node, index)
+        node.prev = prev
+        if node.next is not None:
+            node.next.prev = node
+
+    def _unlink(self, prev: Optional[_DoublyNode], index: int) -> _DoublyNode:
+        removed = LinkedList._unlink(self, prev, index)
+        if removed.next is not None:
+            removed.next.prev = prev
+        return removed
+
+    def _split_after(self, prev: Optional[_DoublyNode],
+                     index: int) -> DoublyLinkedList:
+        new_lst = LinkedList._split_after(self, prev, index)
+        if new_lst._first is not None:
+            new_lst._first.prev = None
+        return new_lst
+
+    def extend(self, items: Iterable) -> None:
+        """Add the items of <items> to the end of this list, in order.
+        """
+        old_last = self._last
+        LinkedList.extend(self, items)
+        if old_last is None:
+            self._relink_prev(None, self._first)
+        else:
+            self._relink_prev(old_last, old_last.next)
+
+    def extendleft(self, items: Iterable) -> None:
+        """Add the items of <items> to the front of this list, in reverse
+        order.
+        """
+        old_first = self._first
+        LinkedList.extendleft(self, items)
+        self._relink_prev(None, self._first, old_first)
+
+    def apply_batch(self, ops: Iterable[tuple]) -> List[Any]:
+        """Apply a sequence of insert and pop operations to this list, as in
+        LinkedList, then restore the prev references in one pass.
+        """
+        popped = LinkedList.apply_batch(self, ops)
+        self._relink_prev(None, self._first)
+        return popped
+
+    def sort(self, key: Optional[Callable[[Any], Any]] = None,
+             reverse: bool = False) -> None:
+        """Sort the items in this list in place, as in LinkedList, then
+        restore the prev references in one pass.
+        """
+        try:
+            LinkedList.sort(self, key, reverse)
+        finally:
+            self._relink_prev(None, self._first)
+
+    def reverse_nodes(self, i: int) -> None:
+        """Reverse the nodes at index i and i + 1 by changing their next and
+        prev references, walking from whichever end is closer.
+        Precondition: Both i and i + 1 are valid indexes in the list.
+
+        >>> lst = DoublyLinkedList([5, 10, 15, 20, 25, 30])
+        >>> lst.reverse_nodes(4)
+        >>> print(lst)
+        [5 -> 10 -> 15 -> 20 -> 30 -> 25]
+        """
+        a = self._node_at(i)
+        b = a.next
+        before, after = a.prev, b.next
+        if before is None:
+            self._first = b
+        else:
+            before.next = b
+        if after is None:
+            self._last = a
+        else:
+            after.prev = a
+        b.prev, b.next = before, a
+        a.prev, a.next = b, after
+
+    def swap_halves(self) -> None:
+        """Move the nodes in the second half of this list to the front.
+        Precondition: len(self) >= 2
+
+        >>> lst = DoublyLinkedList([5, 10, 15, 20, 25])
+        >>> lst.swap_halves()
+        >>> print(lst)
+        [15 -> 20 -> 25 -> 5 -> 10]
+        """
+        old_first, old_last = self._first, self._last
+        LinkedList.swap_halves(self)
+        self._first.prev = None
+        old_first.prev = old_last
+
+    def insert_linked_list(self, other: DoublyLinkedList, pos: int) -> None:
+        """Insert <other> into this linked list immediately before position
+        pos, linking in its existing nodes.
+        Preconditions: 0 <= pos <= len(self), len(other) >= 1, and <other>
+        is a DoublyLinkedList.
+        """
+        old_last = self._last
+        LinkedList.insert_linked_list(self, other, pos)
+        following = other._last.next
+        if following is None:
+            other._first.prev = None if pos == 0 else old_last
+        else:
+            other._first.prev = following.prev
+            following.prev = other._last
+
+
+class ConcurrentLinkedList:
+    """A linked list that can be shared between threads.
+
+    Instead of one lock for the whole list, every node has its own lock, and
+    operations walk the list with hand-over-hand locking: the lock of the
+    next node is taken before the lock of the current one is released.
+    Operations at different positions can therefore proceed at the same
+    time, and a scan only ever blocks the one or two nodes it is on.
+
+    Every operation is atomic with respect to the nodes it changes, but
+    scans (__contains__, average, iteration) do not see a snapshot of the
+    whole list: they may or may not see changes made ahead of them while
+    they run.
+
+    >>> shared = ConcurrentLinkedList(range(100))
+    >>> def worker(n):
+    ...     for i in range(200):
+    ...         shared.insert(i % 50, (n, i))
+    ...         assert shared.pop(len(shared) // 3) is not None
+    >>> threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    >>> for thread in threads:
+    ...     thread.start()
+    >>> for thread in threads:
+    ...     thread.join()
+    >>> len(shared), len(list(shared))
+    (100, 100)
+    """
+    # === Private Attributes ===
+    # _head:
+    #     A sentinel node that comes before the first node in the list. Its
+    #     lock guards the list's first node.
+    # _size:
+    #     The number of nodes in the list, not counting _head.
+    # _size_lock:
+    #     The lock guarding _size.
+    _head: _LockingNode
+    _size: int
+    _size_lock: threading.Lock
+
+    def __init__(self, items: Iterable = ()) -> None:
+        """Initialize a new concurrent linked list containing the given items.
+        """
+        self._head = _LockingNode(None)
+        self._size = 0
+        self._size_lock = threading.Lock()
+        last = self._head
+        for item in items:
+            last.next = last = _LockingNode(item)
+            self._size += 1
+
+    def _add_to_size(self, delta: int) -> None:
+        """Add <delta> to the recorded size of this list.
+        """
+        with self._size_lock:
+            self._size += delta
+
+    def _lock_before(self, index: int) -> _LockingNode:
+        """Walk to the node just before position <index> with hand-over-hand
+        locking, and return it still locked (the sentinel, if <index> is 0).
+        Raise an IndexError, holding no locks, if the list is too short.
+        """
+        pred = self._head
+        pred.lock.acquire()
+        for unused_ in range(index):
+            curr = pred.next
+            if curr is None:
+                pred.lock.release()
+                raise IndexError
+            curr.lock.acquire()
+            pred.lock.release()
+            pred = curr
+        return pred
+
+    def __len__(self) -> int:
+        """Return the number of elements in this list.
+        """
+        return self._size
+
+    def __iter__(self) -> Iterator:
+        """Return an iterator over the items in this list.
+
+        No lock is held while an item is being yielded, so the iterator
+        never blocks other threads between steps.
+        """
+        node = self._head
+        while True:
+            with node.lock:
+                node = node.next
+            if node is None:
+                return
+            yield node.item
+
+    def __str__(self) -> str:
+        """Return a string representation of this list in the form
+        '[item1 -> item2 -> ... -> item-n]'.
+        """
+        return '[' + ' -> '.join(map(str, self)) + ']'
+
+    def __contains__(self, item: Any) -> bool:
+        """Return whether <item> is in this list.
+
+        >>> 3 in ConcurrentLinkedList([1, 2, 3])
+        True
+        """
+        pred = self._head
+        pred.lock.acquire()
+        curr = pred.next
+        while curr is not None:
+            curr.lock.acquire()
+            pred.lock.release()
+            if curr.item == item:
+                curr.lock.release()
+                return True
+            pred, curr = curr, curr.next
+        pred.lock.release()
+        return False
+
+    def insert(self, index: int, item: Any) -> None:
+        """Insert the given item at the given index in this list.
+        Raise an IndexError if index > len(self) when the walk gets there.
+
+        Only the node before <index> is locked while linking in the new
+        node, since any thread unlinking its neighbour must lock it too.
+        """
+        pred = self._lock_before(index)
+        try:
+            pred.next = _LockingNode(item, pred.next)
+        finally:
+            pred.lock.release()
+        self._add_to_size(1)
+
+    def append(self, item: Any) -> None:
+        """Add <item> to the end of this list.
+        """
+        pred = self._head
+        pred.lock.acquire()
+        while pred.next is not None:
+            curr = pred.next
+            curr.lock.acquire()
+            pred.lock.release()
+            pred = curr
+        try:
+            pred.next = _LockingNode(item)
+        finally:
+            pred.lock.release()
+        self._add_to_size(1)
+
+    def pop(self, index: int) -> Any:
+        """Remove and return the item at position <index>.
+        Raise an IndexError if index >= len(self) when the walk gets there.
+
+        >>> lst = ConcurrentLinkedList([1, 2, 10, 200])
+        >>> lst.pop(1), lst.pop(2), str(lst)
+        (2, 200, '[1 -> 10]')
+        """
+        pred = self._lock_before(index)
+        try:
+            curr = pred.next
+            if curr is None:
+                raise IndexError
+            with curr.lock:
+                pred.next = curr.next
+        finally:
+            pred.lock.release()
+        self._add_to_size(-1)
+        return curr.item
+
+    def average(self) -> float:
+        """Return the average of the numbers in this linked list.
+        Preconditions:
+        - this linked list is not empty
+        - all items in this linked list are numbers
+
+        >>> ConcurrentLinkedList([10, 15]).average()
+        12.5
+        """
+        counter = 0
+        accumulator = 0
+        pred = self._head
+        pred.lock.acquire()
+        curr = pred.next
+        while curr is not None:
+            curr.lock.acquire()
+            pred.lock.release()
+            counter += 1
+            accumulator += curr.item
+            pred, curr = curr, curr.next
+        pred.lock.release()
+        return accumulator / counter
+
+
+class ArrayLinkedList:
+    """A linked list with the same interface as LinkedList, but which stores
+    its nodes in parallel arrays instead of as separate objects.
+
+    A node is a slot number: its item is _items[slot] and the slot of the
+    next node is _next[slot]. If <typecode> is given (e.g. 'q' or 'd'), the
+    items are packed into an array.array of that type, which is far more
+    compact than a list of Python objects. Slots freed by pop and bisect are
+    recycled by later insertions.
+    """
+    # === Private Attributes ===
+    # _items:
+    #     The item stored in each slot. Free slots hold None, or 0 when the
+    #     items are packed into an array.
+    # _next:
+    #     The slot of the next node for each slot, or -1 if there is none.
+    #     For a free slot, this is the next free slot instead.
+    # _first:
+    #     The slot of the first node, or -1 if the list is empty.
+    # _last:
+    #     The slot of the last node, or -1 if the list is empty.
+    # _size:
+    #     The number of nodes in the list.
+    # _free:
+    #     The first slot in the free-list, or -1 if no slot is free.
+    # _typecode:
+    #     The array typecode of _items, or None if it is a list.
+    _items: Union[list, array]
+    _next: array
+    _first: int
+    _last: int
+    _size: int
+    _free: int
+    _typecode: Optional[str]
+
+    def __init__(self, items: Iterable = (),
+                 typecode: Optional[str] = None) -> None:
+        """Initialize a new linked list containing the given items.
+
+        >>> lst = ArrayLinkedList([1, 2, 3], 'q')
+        >>> lst.pop(1)
+        2
+        >>> lst.insert(0, 10)
+        >>> str(lst)
+        '[10 -> 1 -> 3]'
+        >>> len(lst._items)  # The slot freed by pop was reused
+        3
+        """
+        self._typecode = typecode
+        if typecode is None:
+            self._items = list(items)
+        else:
+            self._items = array(typecode, items)
+        n = len(self._items)
+        self._next = array('q', range(1, n + 1))
+        if n == 0:
+            self._first = -1
+            self._last = -1
+        else:
+            self._first = 0
+            self._last = n - 1
+            self._next[n - 1] = -1
+        self._size = n
+        self._free = -1
+
+    def __reduce__(self) -> tuple:
+        """Return the information pickle needs to rebuild this list, passing
+        the items as an iterator as in LinkedList.
+        """
+        return (self.__class__, ((), self._typecode), None, iter(self))
+
+    def _empty(self) -> ArrayLinkedList:
+        """Return a new empty list that stores items the same way as this one.
+        """
+        return ArrayLinkedList([], self._typecode)
+
+    def _alloc(self, item: Any) -> int:
+        """Return a slot holding <item> and no next node, reusing a free slot
+        if there is one.
+        """
+        slot = self._free
+        if slot == -1:
+            slot = len(self._next)
+            self._items.append(item)
+            self._next.append(-1)
+        else:
+            self._free = self._next[slot]
+            self._items[slot] = item
+            self._next[slot] = -1
+        return slot
+
+    def _release(self, slot: int) -> None:
+        """Add <slot> to the free-list.
+        """
+        self._items[slot] = None if self._typecode is None else 0
+        self._next[slot] = self._free
+        self._free = slot
+
+    def _slot_at(self, index: int) -> int:
+        """Return the slot of the node at position <index>.
+        Precondition: 0 <= index < len(self)
+        """
+        if index == self._size - 1:
+            return self._last
+        nxt = self._next
+        slot = self._first
+        for unused_ in range(index):
+            slot = nxt[slot]
+        return slot
+
+    def _slots(self) -> Iterator[int]:
+        """Yield the slots of the nodes in this list, in order.
+        """
+        nxt = self._next
+        slot = self._first
+        while slot != -1:
+            yield slot
+            slot = nxt[slot]
+
+    def __iter__(self) -> Iterator:
+        """Return an iterator over the items in this list, in order.
+        """
+        items = self._items
+        for slot in self._slots():
+            yield items[slot]
+
+    def __str__(self) -> str:
+        """Return a string representation of this list in the form
+        '[item1 -> item2 -> ... -> item-n]'.
+
+        >>> str(ArrayLinkedList([1.5, 2.5], 'd'))
+        '[1.5 -> 2.5]'
+        """
+        items = self._items
+        return '[' + ' -> '.join([str(items[slot])
+                                  for slot in self._slots()]) + ']'
+
+    def __len__(self) -> int:
+        """Return the number of elements in this list.
+        """
+        return self._size
+
+    def __getitem__(self, index: int) -> Any:
+        """Return the item at position <index> in this list.
+        Raise an IndexError if <index> is out of bounds.
+        """
+        return self._items[self._slot_at(self._check_index(index))]
+
+    def __setitem__(self, index: int, item: Any) -> None:
+        """Replace the item at position <index> in this list with <item>.
+        Raise an IndexError if <index> is out of bounds.
+        """
+        self._items[self._slot_at(self._check_index(index))] = item
+
+    def _check_index(self, index: int) -> int:
+        """Return <index> as a non-negative position in this list, counting
+        negative indexes from the end.
+        Raise an IndexError if it is out of bounds.
+        """
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError
+        return index
+
+    def _swap_items(self, i: int, j: int) -> None:
+        """Swap the items at positions <i> and <j>.
+        Precondition: 0 <= i, j < len(self)
+        """
+        slot_i, slot_j = self._slot_at(i), self._slot_at(j)
+        items = self._items
+        items[slot_i], items[slot_j] = items[slot_j], items[slot_i]
+
+    def insert(self, index: int, item: Any) -> None:
+        """Insert the given item at the given index in this list.
+        Precondition: 0 <= index <= len(self)
+        """
+        slot = self._alloc(item)
+        if index == 0:
+            self._next[slot] = self._first
+            self._first = slot
+        else:
+            prev = self._slot_at(index - 1)
+            self._next[slot] = self._next[prev]
+            self._next[prev] = slot
+        if self._next[slot] == -1:
+            self._last = slot
+        self._size += 1
+
+    def pop(self, index: int) -> Any:
+        """Remove and return the item at position <index>.
+        Precondition: 0 <= index < len(self)
+        """
+        if index == 0:
+            prev = -1
+            slot = self._first
+            self._first = self._next[slot]
+        else:
+            prev = self._slot_at(index - 1)
+            slot = self._next[prev]
+            self._next[prev] = self._next[slot]
+        if slot == self._last:
+            self._last = prev
+        self._size -= 1
+        item = self._items[slot]
+        self._release(slot)
+        return item
+
+    def reverse_nodes(self, i: int) -> None:
+        """Reverse the nodes at index i and i + 1 by changing their next
+        references (not by changing their items).
+        Precondition: Both i and i + 1 are valid indexes in the list.
+
+        >>> lst = ArrayLinkedList([5, 10, 15])
+        >>> lst.reverse_nodes(1)
+        >>> str(lst)
+        '[5 -> 15 -> 10]'
+        """
+        nxt = self._next
+        if i == 0:
+            a = self._first
+            b = nxt[a]
+            self._first = b
+        else:
+            prev = self._slot_at(i - 1)
+            a = nxt[prev]
+            b = nxt[a]
+            nxt[prev] = b
+        nxt[a] = nxt[b]
+        nxt[b] = a
+        if nxt[a] == -1:
+            self._last = a
+
+    def swap_halves(self) -> None:
+        """Move the nodes in the second half of this list to the front.
+        Precondition: len(self) >= 2
+
+        >>> lst = ArrayLinkedList([5, 10, 15, 20, 25])
+        >>> lst.swap_halves()
+        >>> str(lst)
+        '[15 -> 20 -> 25 -> 5 -> 10]'
+        """
+        first_end = self._slot_at(self._size // 2 - 1)
+        self._next[self._last] = self._first
+        self._first = self._next[first_end]
+        self._next[first_end] = -1
+        self._last = first_end
+
+    def average(self) -> float:
+        """Return the average of the numbers in this linked list.
+        Preconditions:
+        - this linked list is not empty
+        - all items in this linked list are numbers
+
+        >>> ArrayLinkedList([10, 15], 'q').average()
+        12.5
+        """
+        if self._typecode is None:
+            items = self._items
+            total = sum(items[slot] for slot in self._slots())
+        elif self._typecode in 'fd':
+            # Free slots hold 0, so the whole array can be summed at once.
+            total = fsum(self._items)
+        else:
+            total = sum(self._items)
+        return total / self._size
+
+    def intersperse(self, other: ArrayLinkedList) -> None:
+        """Insert the items of <other> in between the items of this linked
+        list, as in LinkedList.intersperse.
+        Precondition: <self> and <other> have the same length.
+
+        >>> lst = ArrayLinkedList([1, 2, 3])
+        >>> lst.intersperse(ArrayLinkedList([10, 20, 30]))
+        >>> str(lst)
+        '[1 -> 10 -> 2 -> 20 -> 3 -> 30]'
+        """
+        slot1 = self._first
+        for slot2 in other._slots():
+            new_slot = self._alloc(other._items[slot2])
+            self._next[new_slot] = self._next[slot1]
+            self._next[slot1] = new_slot
+            slot1 = self._next[new_slot]
+            if slot1 == -1:
+                self._last = new_slot
+        self._size += other._size
+
+    def bisect(self, i: int) -> ArrayLinkedList:
+        """Remove from this linked list the nodes at position i and beyond,
+        and return them in a new linked list.
+        Raise an IndexError if i < 0 or i >= the length of this linked list.
+
+        The removed slots are copied out and returned to this list's
+        free-list.
+        >>> lst = ArrayLinkedList([1, 2, 3, 4])
+        >>> str(lst.bisect(1))
+        '[2 -> 3 -> 4]'
+        >>> str(lst)
+        '[1]'
+        """
+        if i < 0 or i >= self._size:
+            raise IndexError
+        new_lst = self._empty()
+        if i == 0:
+            slot = self._first
+            self._first = -1
+            self._last = -1
+        else:
+            prev = self._slot_at(i - 1)
+            slot = self._next[prev]
+            self._next[prev] = -1
+            self._last = prev
+        while slot != -1:
+            new_lst._items.append(self._items[slot])
+            following = self._next[slot]
+            self._release(slot)
+            slot = following
+        new_lst._size = len(new_lst._items)
+        new_lst._next = array('q', range(1, new_lst._size + 1))
+        new_lst._next[-1] = -1
+        new_lst._first = 0
+        new_lst._last = new_lst._size - 1
+        self._size = i
+        return new_lst
+
+    def do_stuff(self) -> None:
+        """Move each item >= 10 one position earlier, as in
+        LinkedList.do_stuff.
+
+        >>> lst = ArrayLinkedList([1, 2, 3, 10, 5, 6, 10, 8])
+        >>> lst.do_stuff()
+        >>> str(lst)
+        '[1 -> 2 -> 10 -> 3 -> 5 -> 10 -> 6 -> 8]'
+        """
+        items, nxt = self._items, self._next
+        prev = self._first
+        curr = nxt[prev]
+        while curr != -1:
+            if items[curr] >= 10:
+                items[curr], items[prev] = items[prev], items[curr]
+            prev = curr
+            curr = nxt[curr]
+
+    def insert_linked_list(self, other: ArrayLinkedList, pos: int) -> None:
+        """Insert the items of <other> into this linked list immediately
+        before position pos.
+        Preconditions: 0 <= pos <= len(self), len(other) >= 1
+
+        Nodes cannot be shared between two sets of arrays, so the items of
+        <other> are copied into slots of this list; <other> is not changed.
+        >>> lst = ArrayLinkedList([0, 1, 2])
+        >>> lst.insert_linked_list(ArrayLinkedList([10, 11]), 1)
+        >>> str(lst)
+        '[0 -> 10 -> 11 -> 1 -> 2]'
+        """
+        prev = -1 if pos == 0 else self._slot_at(pos - 1)
+        following = self._first if prev == -1 else self._next[prev]
+        for slot in other._slots():
+            new_slot = self._alloc(other._items[slot])
+            if prev == -1:
+                self._first = new_slot
+            else:
+                self._next[prev] = new_slot
+            prev = new_slot
+        self._next[prev] = following
+        if following == -1:
+            self._last = prev
+        self._size += other._size
+
+    @classmethod
+    def from_iterable(cls, items: Iterable,
+                      typecode: Optional[str] = None) -> ArrayLinkedList:
+        """Return a new linked list containing the items of <items>.
+        """
+        return cls(items, typecode)
+
+    def append(self, item: Any) -> None:
+        """Add <item> to the end of this list, in constant time.
+        """
+        slot = self._alloc(item)
+        if self._last == -1:
+            self._first = slot
+        else:
+            self._next[self._last] = slot
+        self._last = slot
+        self._size += 1
+
+    def extend(self, items: Iterable) -> None:
+        """Add the items of <items> to the end of this list, in order.
+
+        >>> lst = ArrayLinkedList([1], 'q')
+        >>> lst.extend(x * 10 for x in range(2, 4))
+        >>> str(lst)
+        '[1 -> 20 -> 30]'
+        >>> lst.extend(lst)
+        >>> str(lst)
+        '[1 -> 20 -> 30 -> 1 -> 20 -> 30]'
+        """
+        if items is self:
+            # Iterating over this list while appending to it would never end.
+            items = list(items)
+        for item in items:
+            self.append(item)
+
+    def extendleft(self, items: Iterable) -> None:
+        """Add the items of <items> to the front of this list, one at a time,
+        so that they end up in reverse order.
+        """
+        for item in items:
+            slot = self._alloc(item)
+            self._next[slot] = self._first
+            self._first = slot
+            if self._last == -1:
+                self._last = slot
+            self._size += 1
+
+
+class _Block:
+    """A node in an unrolled linked list, holding up to a fixed number of
+    items.
+
+    Like _Node, this is a private class used only in this module.
+
+    === Attributes ===
+    items:
+        The items stored in this block, in order. Only the last block of an
+        empty list is ever empty.
+    next:
+        The next block in the list, or None if there are no more blocks.
+    """
+    __slots__ = ('items', 'next')
+    items: list
+    next: Optional[_Block]
+
+    def __init__(self, items: list, next: Optional[_Block] = None) -> None:
+        """Initialize a new block storing <items>, followed by <next>.
+        """
+        self.items = items
+        self.next = next
+
+
+class UnrolledLinkedList:
+    """A linked list with the same interface as LinkedList, but which stores
+    up to <capacity> items in each node.
+
+    Traversals follow one pointer per block instead of one per item, and
+    the items in a block sit together in one Python list. Inserting into a
+    full block splits it in two, and a block that falls below half full
+    after a pop absorbs the block after it when they fit together.
+    """
+    # === Private Attributes ===
+    # _first:
+    #     The first block in the list, or None if the list is empty.
+    # _last:
+    #     The last block in the list, or None if the list is empty.
+    # _size:
+    #     The number of items in the list.
+    # _capacity:
+    #     The maximum number of items in a block.
+    _first: Optional[_Block]
+    _last: Optional[_Block]
+    _size: int
+    _capacity: int
+
+    def __init__(self, items: Iterable = (), capacity: int = 64) -> None:
+        """Initialize a new unrolled linked list containing the given items,
+        packing <capacity> items into each block.
+        Precondition: capacity >= 2
+
+        >>> lst = UnrolledLinkedList(range(5), capacity=2)
+        >>> str(lst)
+        '[0 -> 1 -> 2 -> 3 -> 4]'
+        >>> lst.block_count()
+        3
+        """
+        self._first = None
+        self._last = None
+        self._size = 0
+        self._capacity = capacity
+        self.extend(items)
+
+    def __reduce__(self) -> tuple:
+        """Return the information pickle needs to rebuild this list, passing
+        the items as an iterator as in LinkedList.
+        """
+        return (self.__class__, ((), self._capacity), None, iter(self))
+
+    def _empty(self) -> UnrolledLinkedList:
+        """Return a new empty list with the same block capacity as this one.
+        """
+        return UnrolledLinkedList((), self._capacity)
+
+    def block_count(self) -> int:
+        """Return the number of blocks in this list.
+        """
+        count = 0
+        block = self._first
+        while block is not None:
+            count += 1
+            block = block.next
+        return count
+
+    def append(self, item: Any) -> None:
+        """Add <item> to the end of this list, in constant time.
+        """
+        last = self._last
+        if last is None:
+            self._first = self._last = _Block([item])
+        elif len(last.items) == self._capacity:
+            last.next = self._last = _Block([item])
+        else:
+            last.items.append(item)
+        self._size += 1
+
+    def extend(self, items: Iterable) -> None:
+        """Add the items of <items> to the end of this list, in order, filling
+        the last block before starting new ones.
+        >>> lst = UnrolledLinkedList([1, 2, 3], capacity=2)
+        >>> lst.extend(lst)
+        >>> str(lst), lst.block_count()
+        ('[1 -> 2 -> 3 -> 1 -> 2 -> 3]', 3)
+        """
+        if items is self:
+            # Iterating over this list while appending to it would never end.
+            items = list(items)
+        capacity = self._capacity
+        last = self._last
+        for item in items:
+            if last is None:
+                last = self._first = _Block([item])
+            elif len(last.items) == capacity:
+                last.next = last = _Block([item])
+            else:
+                last.items.append(item)
+            self._size += 1
+        self._last = last
+
+    def extendleft(self, items: Iterable) -> None:
+        """Add the items of <items> to the front of this list, one at a time,
+        so that they end up in reverse order, as in LinkedList.extendleft.
+
+        The first block is filled from the left before new blocks are put in
+        front of it.
+        >>> lst = UnrolledLinkedList([10, 11], capacity=3)
+        >>> lst.extendleft(range(5))
+        >>> str(lst), lst.block_count()
+        ('[4 -> 3 -> 2 -> 1 -> 0 -> 10 -> 11]', 3)
+        """
+        capacity = self._capacity
+        first = self._first
+        # The items for a new first block, in the order they arrived.
+        pending = []
+        for item in items:
+            if first is not None and len(first.items) < capacity:
+                first.items.insert(0, item)
+            else:
+                pending.append(item)
+                if len(pending) == capacity:
+                    first = self._push_block(pending)
+                    pending = []
+            self._size += 1
+        if pending:
+            self._push_block(pending)
+
+    def _push_block(self, pending: list) -> _Block:
+        """Put a new block holding the items of <pending>, reversed, at the
+        front of this list, and return it.
+        """
+        pending.reverse()
+        self._first = _Block(pending, self._first)
+        if self._last is None:
+            self._last = self._first
+        return self._first
+
+    @classmethod
+    def from_iterable(cls, items: Iterable,
+                      capacity: int = 64) -> UnrolledLinkedList:
+        """Return a new unrolled linked list containing the items of
+        <items>, which is consumed lazily, packing <capacity> items into
+        each block.
+
+        >>> str(UnrolledLinkedList.from_iterable(iter('abc'), 2))
+        '[a -> b -> c]'
+        """
+        return cls(items, capacity)
+
+    def __iter__(self) -> Iterator:
+        """Return an iterator over the items in this list, in order.
+        """
+        block = self._first
+        while block is not None:
+            yield from block.items
+            block = block.next
+
+    def __str__(self) -> str:
+        """Return a string representation of this list in the form
+        '[item1 -> item2 -> ... -> item-n]'.
+
+        >>> str(UnrolledLinkedList([]))
+        '[]'
+        """
+        return '[' + ' -> '.join(map(str, self)) + ']'
+
+    def __len__(self) -> int:
+        """Return the number of elements in this list.
+        """
+        return self._size
+
+    def _check_index(self, index: int) -> int:
+        """Return <index> as a non-negative position in this list, counting
+        negative indexes from the end.
+        Raise an IndexError if it is out of bounds.
+        """
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError
+        return index
+
+    def _locate(self, index: int) -> Tuple[Optional[_Block], _Block, int]:
+        """Return (prev, block, offset) such that the item at position
+        <index> is block.items[offset], and prev is the block before
+        <block> (or None if it is the first block).
+        Precondition: 0 <= index < len(self)
+        """
+        prev = None
+        block = self._first
+        while index >= len(block.items):
+            index -= len(block.items)
+            prev = block
+            block = block.next
+        return prev, block, index
+
+    def _cut(self, index: int) -> Optional[_Block]:
+        """Make sure that a block starts at position <index>, splitting a
+        block if necessary, and return the block that ends just before it
+        (or None if <index> is 0).
+        Precondition: 0 <= index <= len(self)
+        """
+        if index == 0:
+            return None
+        elif index == self._size:
+            return self._last
+        prev, block, offset = self._locate(index)
+        if offset == 0:
+            return prev
+        block.next = _Block(block.items[offset:], block.next)
+        del block.items[offset:]
+        if block is self._last:
+            self._last = block.next
+        return block
+
+    def __getitem__(self, index: int) -> Any:
+        """Return the item at position <index> in this list.
+        Raise an IndexError if <index> is out of bounds.
+
+        >>> UnrolledLinkedList(range(10), capacity=3)[7]
+        7
+        """
+        unused_prev, block, offset = self._locate(self._check_index(index))
+        return block.items[offset]
+
+    def __setitem__(self, index: int, item: Any) -> None:
+        """Replace the item at position <index> in this list with <item>.
+        Raise an IndexError if <index> is out of bounds.
+        """
+        unused_prev, block, offset = self._locate(self._check_index(index))
+        block.items[offset] = item
+
+    def _swap_items(self, i: int, j: int) -> None:
+        """Swap the items at positions <i> and <j>.
+        Precondition: 0 <= i, j < len(self)
+        """
+        unused_prev, block_i, offset_i = self._locate(i)
+        unused_prev, block_j, offset_j = self._locate(j)
+        block_i.items[offset_i], block_j.items[offset_j] = \
+            block_j.items[offset_j], block_i.items[offset_i]
+
+    def insert(self, index: int, item: Any) -> None:
+        """Insert the given item at the given index in this list, splitting
+        the block it lands in if that block is full.
+        Precondition: 0 <= index <= len(self)
+
+        >>> lst = UnrolledLinkedList([1, 2, 3, 4], capacity=2)
+        >>> lst.insert(1, 1.5)
+        >>> str(lst)
+        '[1 -> 1.5 -> 2 -> 3 -> 4]'
+        >>> lst.block_count()
+        3
+        """
+        if index == self._size:
+            self.append(item)
+            return
+        unused_prev, block, offset = self._locate(index)
+        if len(block.items) >= self._capacity:
+            half = self._capacity // 2
+            block.next = _Block(block.items[half:], block.next)
+            del block.items[half:]
+            if block is self._last:
+                self._last = block.next
+            if offset > half:
+                block = block.next
+                offset -= half
+        block.items.insert(offset, item)
+        self._size += 1
+
+    def pop(self, index: int) -> Any:
+        """Remove and return the item at position <index>, merging its
+        block with the next one if it has become less than half full.
+        Precondition: 0 <= index < len(self)
+
+        >>> lst = UnrolledLinkedList([1, 2, 3, 4, 5], capacity=4)
+        >>> lst.pop(1)
+        2
+        >>> lst.pop(1)
+        3
+        >>> lst.pop(1)
+        4
+        >>> str(lst), lst.block_count()
+        ('[1 -> 5]', 1)
+        """
+        prev, block, offset = self._locate(index)
+        item = block.items.pop(offset)
+        self._size -= 1
+        following = block.next
+        if not block.items:
+            if prev is None:
+                self._first = following
+            else:
+                prev.next = following
+            if block is self._last:
+                self._last = prev
+        elif (following is not None
+              and len(block.items) < self._capacity // 2
+              and len(block.items) + len(following.items) <= self._capacity):
+            block.items.extend(following.items)
+            block.next = following.next
+            if following is self._last:
+                self._last = block
+        return item
+
+    def reverse_nodes(self, i: int) -> None:
+        """Swap the items at index i and i + 1.
+
+        Items are not individual nodes in an unrolled list, so this moves the
+        items within their blocks instead of relinking anything.
+        Precondition: Both i and i + 1 are valid indexes in the list.
+        >>> lst = UnrolledLinkedList([5, 10, 15, 20], capacity=2)
+        >>> lst.reverse_nodes(1)
+        >>> str(lst)
+        '[5 -> 15 -> 10 -> 20]'
+        """
+        unused_prev, block, offset = self._locate(i)
+        if offset + 1 < len(block.items):
+            other, other_offset = block, offset + 1
+        else:
+            other, other_offset = block.next, 0
+        block.items[offset], other.items[other_offset] = \
+            other.items[other_offset], block.items[offset]
+
+    def swap_halves(self) -> None:
+        """Move the items in the second half of this list to the front.
 
+        The list is cut on a block boundary at the midpoint, and the two
+        chains of blocks are relinked.
+        Precondition: len(self) >= 2
+        >>> lst = UnrolledLinkedList([5, 10, 15, 20, 25], capacity=2)
+        >>> lst.swap_halves()
+        >>> str(lst)
+        '[15 -> 20 -> 25 -> 5 -> 10]'
+        """
+        first_end = self._cut(self._size // 2)
+        self._last.next = self._first
+        self._first = first_end.next
+        first_end.next = None
+        self._last = first_end
+
+    def average(self) -> float:
+        """Return the average of the numbers in this linked list.
+        Preconditions:
+        - this linked list is not empty
+        - all items in this linked list are numbers
+
+        >>> UnrolledLinkedList([10, 15]).average()
+        12.5
+        """
+        accumulator = 0
+        block = self._first
+        while block is not None:
+            accumulator += sum(block.items)
+            block = block.next
+        return accumulator / self._size
+
+    def intersperse(self, other: Iterable) -> None:
+        """Insert the items of <other> in between the items of this linked
+        list, as in LinkedList.intersperse. <other> is not changed.
+        Precondition: <self> and <other> have the same length.
+
+        >>> lst = UnrolledLinkedList([1, 2, 3], capacity=2)
+        >>> lst.intersperse(UnrolledLinkedList([10, 20, 30]))
+        >>> str(lst)
+        '[1 -> 10 -> 2 -> 20 -> 3 -> 30]'
+        """
+        pairs = zip(iter(self), iter(other))
+        merged = self._empty()
+        merged.extend(item for pair in pairs for item in pair)
+        self._first, self._last, self._size = \
+            merged._first, merged._last, merged._size
+
+    def bisect(self, i: int) -> UnrolledLinkedList:
+        """Remove from this linked list the items at position i and beyond,
+        and return them in a new linked list.
+        Raise an IndexError if i < 0 or i >= the length of this linked list.
+
+        Only the block containing position i is split; the blocks after it
+        are moved to the new list as they are.
+        >>> lst = UnrolledLinkedList([1, 2, 3, 4], capacity=3)
+        >>> str(lst.bisect(1))
+        '[2 -> 3 -> 4]'
+        >>> str(lst)
+        '[1]'
+        """
+        if i < 0 or i >= self._size:
+            raise IndexError
+        prev = self._cut(i)
+        new_lst = self._empty()
+        new_lst._first = self._first if prev is None else prev.next
+        new_lst._last = self._last
+        new_lst._size = self._size - i
+        if prev is None:
+            self._first = None
+        else:
+            prev.next = None
+        self._last = prev
+        self._size = i
+        return new_lst
 
+    def do_stuff(self) -> None:
+        """Move each item >= 10 one position earlier, as in
+        LinkedList.do_stuff.
+
+        >>> lst = UnrolledLinkedList([1, 2, 3, 10, 5, 6, 10, 8], capacity=3)
+        >>> lst.do_stuff()
+        >>> str(lst)
+        '[1 -> 2 -> 10 -> 3 -> 5 -> 10 -> 6 -> 8]'
+        """
+        prev_items, prev_offset = None, 0
+        block = self._first
+        while block is not None:
+            items = block.items
+            for offset in range(len(items)):
+                if prev_items is not None and items[offset] >= 10:
+                    items[offset], prev_items[prev_offset] = \
+                        prev_items[prev_offset], items[offset]
+                prev_items, prev_offset = items, offset
+            block = block.next
+
+    def insert_linked_list(self, other: UnrolledLinkedList, pos: int) -> None:
+        """Insert <other> into this linked list immediately before position
+        pos, linking in its blocks without copying their items.
+        Preconditions: 0 <= pos <= len(self), len(other) >= 1
+
+        The blocks of <other> are used as they are, so <other> should have
+        the same capacity as this list.
+
+        >>> lst = UnrolledLinkedList([0, 1, 2, 3], capacity=2)
+        >>> lst.insert_linked_list(UnrolledLinkedList([10, 11]), 1)
+        >>> str(lst)
+        '[0 -> 10 -> 11 -> 1 -> 2 -> 3]'
+        """
+        prev = self._cut(pos)
+        following = self._first if prev is None else prev.next
+        if prev is None:
+            self._first = other._first
+        else:
+            prev.next = other._first
+        other._last.next = following
+        if following is None:
+            self._last = other._last
+        self._size += other._size
+
+
+################################################################################
+# Binary serialization
+################################################################################
+# A dumped list starts with a header: the magic bytes b'LLST', a format
+# version byte, a kind byte and the number of items as an unsigned 64-bit
+# integer, all little-endian. The kind says how the items follow:
+#   b'q': each item is a signed 64-bit integer
+#   b'd': each item is a 64-bit float
+#   b'p': each item is pickled, preceded by its length as an unsigned
+#         32-bit integer
+_HEADER = struct.Struct('<4sBcQ')
+_MAGIC = b'LLST'
+_VERSION = 1
+_LENGTH = struct.Struct('<I')
+# The number of items, or bytes of pickled records, written or read at once.
+_CHUNK_ITEMS = 1 << 16
+_CHUNK_BYTES = 1 << 20
+
+
+def _item_kind(items: Iterable) -> bytes:
+    """Return the most compact kind of record that can hold all of <items>.
+    """
+    kind = None
+    for item in items:
+        if type(item) is int and -(1 << 63) <= item < (1 << 63):
+            item_kind = b'q'
+        elif type(item) is float:
+            item_kind = b'd'
+        else:
+            return b'p'
+        if kind is None:
+            kind = item_kind
+        elif kind != item_kind:
+            return b'p'
+    return b'q' if kind is None else kind
+
+
+def _to_little_endian(chunk: array) -> array:
+    """Return <chunk> with its items stored in little-endian byte order.
+    """
+    if sys.byteorder == 'big':
+        chunk.byteswap()
+    return chunk
+
+
+def dump(lst: Iterable, file: BinaryIO, kind: Optional[bytes] = None) -> None:
+    """Write the items of <lst>, a list from this module, to the binary file
+    object <file>.
+
+    Items are written in chunks as they are read from the list, so the list
+    is never copied or turned into one big string. If <kind> is not given,
+    lists of 64-bit ints or of floats use a fixed-width record per item and
+    anything else is pickled item by item.
+
+    >>> import io
+    >>> buffer = io.BytesIO()
+    >>> dump(LinkedList([1, 2, 3]), buffer)
+    >>> len(buffer.getvalue())  # A 14-byte header and three 8-byte items
+    38
+    >>> str(load(io.BytesIO(buffer.getvalue())))
+    '[1 -> 2 -> 3]'
+    """
+    if kind is None:
+        kind = _item_kind(lst)
+    file.write(_HEADER.pack(_MAGIC, _VERSION, kind, len(lst)))
+    if kind == b'p':
+        buffer = bytearray()
+        for item in lst:
+            record = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+            buffer += _LENGTH.pack(len(record))
+            buffer += record
+            if len(buffer) >= _CHUNK_BYTES:
+                file.write(buffer)
+                buffer.clear()
+        file.write(buffer)
+    else:
+        chunk = array(kind.decode())
+        for item in lst:
+            chunk.append(item)
+            if len(chunk) == _CHUNK_ITEMS:
+                file.write(_to_little_endian(chunk).tobytes())
+                chunk = array(kind.decode())
+        file.write(_to_little_endian(chunk).tobytes())
+
+
+def _read_header(data: bytes) -> Tuple[bytes, int]:
+    """Return the kind and item count from the header <data>.
+    Raise a ValueError if it is not the header of a dumped list.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError('truncated linked list header')
+    magic, version, kind, count = _HEADER.unpack(data[:_HEADER.size])
+    if magic != _MAGIC or version != _VERSION or kind not in (b'q', b'd', b'p'):
+        raise ValueError('not a dumped linked list')
+    return kind, count
+
+
+def iter_load(file: BinaryIO) -> Iterator:
+    """Yield the items dumped to the binary file object <file>, reading it
+    in chunks.
+    """
+    kind, count = _read_header(file.read(_HEADER.size))
+    if kind == b'p':
+        for unused_ in range(count):
+            length, = _LENGTH.unpack(file.read(_LENGTH.size))
+            yield pickle.loads(file.read(length))
+    else:
+        remaining = count
+        while remaining > 0:
+            chunk = array(kind.decode())
+            size = min(remaining, _CHUNK_ITEMS)
+            chunk.frombytes(file.read(size * chunk.itemsize))
+            yield from _to_little_endian(chunk)
+            remaining -= size
+
+
+def load(file: BinaryIO, cls: Callable[[Iterable], Any] = LinkedList) -> Any:
+    """Return a new list of class <cls> containing the items dumped to the
+    binary file object <file>. The items are streamed into the list, not
+    read into memory first.
+    """
+    return cls(iter_load(file))
+
+
+class MappedList:
+    """A read-only view of a list dumped to a file, backed by a memory map.
+
+    Only the pages that are actually read are loaded from disk, so a large
+    file can be iterated, or turned into a linked list, without first being
+    read into memory. Lists of fixed-width items also support constant-time
+    indexing.
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'floats.bin')
+    >>> with open(path, 'wb') as file:
+    ...     dump(LinkedList([0.5, 1.5, 2.5]), file)
+    >>> with MappedList(path) as mapped:
+    ...     len(mapped), mapped[2], str(mapped.to_linked_list())
+    (3, 2.5, '[0.5 -> 1.5 -> 2.5]')
+    """
+    # === Private Attributes ===
+    # _path:
+    #     The path of the mapped file.
+    # _file:
+    #     The open file, or None if this view is closed.
+    # _map:
+    #     The memory map of the whole file, or None if this view is closed.
+    # _kind:
+    #     The kind of record the items are stored as.
+    # _count:
+    #     The number of items.
+    _path: str
+    _file: Optional[BinaryIO]
+    _map: Optional[mmap.mmap]
+    _kind: bytes
+    _count: int
+
+    def __init__(self, path: str) -> None:
+        """Map the dumped list in the file at <path>.
+        """
+        self._path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._kind, self._count = _read_header(self._map[:_HEADER.size])
+
+    def __reduce__(self) -> tuple:
+        """Return the information pickle needs to map the same file again.
+        """
+        return (self.__class__, (self._path,))
+
+    def close(self) -> None:
+        """Unmap and close the file.
+        """
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+    def __enter__(self) -> MappedList:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of items in the dumped list.
+        """
+        return self._count
+
+    def __getitem__(self, index: int) -> Any:
+        """Return the item at position <index>.
+        Raise an IndexError if <index> is out of bounds, and a TypeError if
+        the items are pickled records, which can only be read in order.
+        """
+        if self._kind == b'p':
+            raise TypeError('pickled records do not support indexing')
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError
+        offset = _HEADER.size + 8 * index
+        return struct.unpack_from('<' + self._kind.decode(), self._map,
+                                  offset)[0]
+
+    def __iter__(self) -> Iterator:
+        """Yield the items in the dumped list, in order.
+        """
+        data = self._map
+        offset = _HEADER.size
+        if self._kind == b'p':
+            for unused_ in range(self._count):
+                length, = _LENGTH.unpack_from(data, offset)
+                offset += _LENGTH.size
+                yield pickle.loads(data[offset:offset + length])
+                offset += length
+        else:
+            end = _HEADER.size + 8 * self._count
+            while offset < end:
+                chunk = array(self._kind.decode())
+                stop = min(end, offset + 8 * _CHUNK_ITEMS)
+                chunk.frombytes(data[offset:stop])
+                yield from _to_little_endian(chunk)
+                offset += 8 * len(chunk)
+
+    def to_linked_list(self,
+                       cls: Callable[[Iterable], Any] = LinkedList) -> Any:
+        """Return a new list of class <cls> containing the mapped items,
+        streamed in from the file.
+        """
+        return cls(iter(self))
@@ -1,9 +1,131 @@
 from __future__ import annotations
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import reduce
+from heapq import heappop, heappush
+from itertools import count
+from math import gcd
+from operator import add, and_, not_
 from typing import *
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-def all_greater_than(obj: Union[int, List], n: int) -> bool:
+
+def _fold(obj: Union[int, List], leaf: Callable[[int], Any], start: Any,
+          combine: Callable[[Any, Any], Any],
+          finish: Optional[Callable[[Any], Any]] = None,
+          stop: Optional[Callable[[Any], bool]] = None) -> Any:
+    """Return the value of <obj>, where the value of an int is leaf(obj),
+    and the value of a list is found by folding the values of its items
+    into an accumulator with combine(accumulator, value), from <start>, and
+    then passing the result to finish() (if given).
+
+    As soon as stop(accumulator) is true, the rest of that list is skipped:
+    its value is then already decided.
+
+    The lists are walked with an explicit stack of iterators rather than by
+    recursion, so there is no limit on how deeply <obj> can be nested.
+    Raise a TypeError on reaching anything that is neither an int nor a list,
+    such as a str, which would otherwise be iterated into forever.
+
+    >>> _fold([1, [2, [3]]], str, '', add)
+    '123'
+    >>> _fold([1, ['ab']], str, '', add)
+    Traceback (most recent call last):
+    ...
+    TypeError: expected an int or a list, not str
+    """
+    if isinstance(obj, int):
+        return leaf(obj)
+    _check_list(obj)
+    stack = [[iter(obj), start]]
+    while True:
+        frame = stack[-1]
+        for item in frame[0]:
+            if not isinstance(item, int):
+                _check_list(item)
+                stack.append([iter(item), start])
+                break
+            frame[1] = combine(frame[1], leaf(item))
+            if stop is not None and stop(frame[1]):
+                break
+        if stack[-1] is not frame:
+            continue
+        stack.pop()
+        value = frame[1] if finish is None else finish(frame[1])
+        if not stack:
+            return value
+        parent = stack[-1]
+        parent[1] = combine(parent[1], value)
+        if stop is not None and stop(parent[1]):
+            parent[0] = iter(())
+
+
+def _check_list(obj: Any) -> None:
+    """Raise a TypeError if <obj>, which is not an int, is not a list either.
+    """
+    if not isinstance(obj, list):
+        raise TypeError(f'expected an int or a list, not {type(obj).__name__}')
+
+
+def _split_work(obj: List, pieces: int) -> Tuple[List[int], List[List]]:
+    """Split the nested list <obj> into <pieces> lists of its subtrees, of
+    roughly equal size, and return the ints at the top of <obj> that ended
+    up outside any subtree, along with the non-empty pieces.
+
+    The size of a subtree is estimated by its length, which is free to
+    find: the longest subtree is replaced by its own items until there are
+    enough subtrees to go around, then the subtrees are dealt out, longest
+    first, to whichever piece is smallest so far. A list whose only item is
+    another list is replaced by that list straight away, since its length
+    of 1 says nothing about its size.
+
+    >>> leaves, chunks = _split_work([[[[1, 2]]] * 100], 4)
+    >>> leaves, [len(chunk) for chunk in chunks]
+    ([], [25, 25, 25, 25])
+    """
+    leaves = []
+    heap = []
+    tiebreak = count()
+
+    def push(sublist: List) -> None:
+        while len(sublist) == 1 and isinstance(sublist[0], list):
+            sublist = sublist[0]
+        heappush(heap, (-len(sublist), next(tiebreak), sublist))
+
+    for item in obj:
+        if isinstance(item, int):
+            leaves.append(item)
+        else:
+            push(item)
+    while heap and len(heap) < pieces * 4 and -heap[0][0] > 1:
+        unused_, unused_, sublist = heappop(heap)
+        for item in sublist:
+            if isinstance(item, int):
+                leaves.append(item)
+            else:
+                push(item)
+    loads = [(0, i) for i in range(pieces)]
+    chunks = [[] for unused_ in range(pieces)]
+    for negated, unused_, sublist in sorted(heap):
+        load, i = heappop(loads)
+        chunks[i].append(sublist)
+        heappush(loads, (load - negated, i))
+    return leaves, [chunk for chunk in chunks if chunk]
+
+
+def all_greater_than(obj: Union[int, List], n: int,
+                     workers: Optional[int] = None) -> bool:
     """Return True iff all the items in <obj> are greater than n.
+
+    If <workers> is more than 1, the subtrees of <obj> are checked in that
+    many processes, a few chunks per process; the first chunk found to
+    hold an item <= n cancels every chunk not yet started.
+
     >>> all_greater_than(13, 10)
     True
     >>> all_greater_than(13, 40)
@@ -12,18 +134,32 @@ def all_greater_than(obj: Union[int, List], n: int) -> bool:
     True
     >>> all_greater_than([[1, 2, 3], 4, [[5]]], 3)
     False
+    >>> all_greater_than([[1, 2, 3], 4, [[5]]] * 100, 0, workers=2)
+    True
     """
-    if isinstance(obj, int):
-        return obj > n
-    else:
-        boolean = True
-        for sublist in obj:
-            boolean &= all_greater_than(sublist, n)
-        return boolean
+    if isinstance(obj, FlatNested):
+        return obj.all_greater_than(n)
+    if workers is not None and workers > 1 and not isinstance(obj, int):
+        leaves, chunks = _split_work(obj, workers * 4)
+        if not all(item > n for item in leaves):
+            return False
+        executor = ProcessPoolExecutor(workers)
+        try:
+            futures = [executor.submit(all_greater_than, chunk, n)
+                       for chunk in chunks]
+            return all(future.result() for future in as_completed(futures))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    return _fold(obj, lambda item: item > n, True, and_, stop=not_)
 
 
-def count_matches(obj: Union[int, List], n: int) -> int:
+def count_matches(obj: Union[int, List], n: int,
+                  workers: Optional[int] = None) -> int:
     """Return the number of times that n occurs in obj.
+
+    If <workers> is more than 1, the subtrees of <obj> are counted in that
+    many processes, a few chunks per process, and the counts are added up.
+
     >>> count_matches(100, 100)
     1
     >>> count_matches(100, 3)
@@ -34,23 +170,115 @@ def count_matches(obj: Union[int, List], n: int) -> int:
     1
     >>> count_matches([10, [[20]], [10, [10]]], 30)
     0
+    >>> count_matches([10, [[20]], [10, [10]]] * 100, 10, workers=2)
+    300
     """
-    if isinstance(obj, int):
-        if obj == n:
-            return 1
-        else:
-            return 0
-    else:
-        count = 0
-        for sublist in obj:
-            count += count_matches(sublist, n)
-        return count
+    if isinstance(obj, FlatNested):
+        return obj.count_matches(n)
+    if workers is not None and workers > 1 and not isinstance(obj, int):
+        leaves, chunks = _split_work(obj, workers * 4)
+        with ProcessPoolExecutor(workers) as executor:
+            counts = executor.map(count_matches, chunks,
+                                  [n] * len(chunks))
+            return leaves.count(n) + sum(counts)
+    return _fold(obj, lambda item: int(item == n), 0, add)
+
+
+class _PackTable:
+    """The amounts that can be bought with packs of some fixed sizes.
+
+    Amounts are counted in units of the gcd of the sizes (no other amount
+    can be bought), and stored as the bits of one Python int: bit i is set
+    iff i units can be bought. The table is only extended when a larger
+    amount is asked about, and never past the Frobenius number, above which
+    every amount can be bought.
+
+    === Attributes ===
+    unit:
+        The gcd of the pack sizes.
+    sizes:
+        The distinct pack sizes in units, in increasing order.
+    bits:
+        The reachability bitset, valid for amounts below <limit>.
+    limit:
+        The number of amounts the bitset covers.
+    frobenius:
+        The largest amount that cannot be bought, or None if it is not yet
+        known.
+    """
+    __slots__ = ('unit', 'sizes', 'bits', 'limit', 'frobenius')
+    unit: int
+    sizes: Tuple[int, ...]
+    bits: int
+    limit: int
+    frobenius: Optional[int]
+
+    def __init__(self, sizes: Tuple[int, ...]) -> None:
+        """Initialize a table for the distinct, increasing <sizes>.
+        """
+        self.unit = reduce(gcd, sizes)
+        self.sizes = tuple(size // self.unit for size in sizes)
+        self.bits = 1
+        self.limit = 1
+        self.frobenius = None
+
+    def extend(self, amount: int) -> None:
+        """Extend the table to cover <amount>, unless every amount from the
+        current limit on is already known to be buyable.
 
+        Each round fills in the next sizes[0] amounts at once, since all of
+        them are reached from amounts already in the table. A round that
+        fills in sizes[0] buyable amounts in a row proves that every larger
+        amount is buyable, which pins down the Frobenius number.
+        """
+        step = self.sizes[0]
+        full = (1 << step) - 1
+        while self.limit <= amount and self.frobenius is None:
+            base = max(0, self.limit - self.sizes[-1])
+            window = self.bits >> base
+            chunk = 0
+            for size in self.sizes:
+                chunk |= window << size
+            chunk = (chunk >> (self.limit - base)) & full
+            if chunk == full:
+                missing = ~self.bits & ((1 << self.limit) - 1)
+                self.frobenius = missing.bit_length() - 1
+            self.bits |= chunk << self.limit
+            self.limit += step
 
-def buyable(n: int) -> bool:
-    """Return whether one can buy exactly <n> McNuggets.
+    def reachable(self, amount: int) -> bool:
+        """Return whether <amount> units can be bought.
+        """
+        if amount < 0:
+            return False
+        self.extend(amount)
+        if self.frobenius is not None and amount > self.frobenius:
+            return True
+        return bool(self.bits >> amount & 1)
+
+
+_PACK_TABLES: Dict[Tuple[int, ...], _PackTable] = {}
+
+
+def _pack_table(sizes: Iterable[int]) -> _PackTable:
+    """Return the cached _PackTable for <sizes>, creating it if needed.
+    """
+    key = tuple(sorted(set(sizes)))
+    if key not in _PACK_TABLES:
+        _PACK_TABLES[key] = _PackTable(key)
+    return _PACK_TABLES[key]
+
+
+def buyable(n: int, sizes: Iterable[int] = (4, 6, 25)) -> bool:
+    """Return whether one can buy exactly <n> McNuggets with packs of the
+    given sizes.
     It is considered possible to buy exactly 0 McNuggets.
-    Precondition: n >= 0
+    Precondition: n >= 0, and <sizes> is non-empty and all positive
+
+    The answers come from a table shared by every call with the same sizes,
+    so each amount is only ever worked out once, and anything above the
+    Frobenius number (43 for the default sizes) is answered immediately.
+
     >>> buyable(6)
     True
     >>> buyable(35)
@@ -61,21 +289,118 @@ def buyable(n: int) -> bool:
     False
     >>> buyable(55)
     True
+    >>> buyable(0)
+    True
+    >>> buyable(10 ** 30)
+    True
+    >>> buyable(15, (6, 9, 20)), buyable(43, (6, 9, 20)), buyable(44, (6, 9))
+    (True, False, False)
     """
-    if n in [4, 6, 25]:
-        return True
-    elif n < 4:
+    table = _pack_table(sizes)
+    if n < 0 or n % table.unit:
         return False
-    else:
-        buyability = False
-        for size in [4, 6, 25]:
-            buyability |= buyable(n - size)
-        return buyability
+    return table.reachable(n // table.unit)
+
+
+def buyable_batch(ns: Iterable[int],
+                  sizes: Iterable[int] = (4, 6, 25)) -> Any:
+    """Return, for each amount in <ns>, whether it is buyable(n, sizes).
+
+    A NumPy integer array is answered in one vectorized pass over a lookup
+    array built from the table, and a NumPy bool array is returned. Any
+    other iterable gives a list of bools.
+
+    >>> buyable_batch([5, 6, 13, 55])
+    [False, True, False, True]
+    """
+    table = _pack_table(sizes)
+    if numpy is None or not isinstance(ns, numpy.ndarray):
+        return [buyable(n, sizes) for n in ns]
+    ns = ns.astype(numpy.int64)
+    if ns.size:
+        table.extend(int(ns.max()) // table.unit)
+    raw = table.bits.to_bytes((table.limit + 7) // 8, 'little')
+    lookup = numpy.unpackbits(numpy.frombuffer(raw, numpy.uint8),
+                              bitorder='little')[:table.limit].astype(bool)
+    amounts, remainders = numpy.divmod(ns, table.unit)
+    found = lookup[numpy.clip(amounts, 0, table.limit - 1)]
+    if table.frobenius is not None:
+        found |= amounts > table.frobenius
+    return (ns >= 0) & (remainders == 0) & found
+
+
+def pack_combination(n: int, sizes: Iterable[int] = (4, 6, 25)
+                     ) -> Optional[Dict[int, int]]:
+    """Return how many packs of each size to buy to get exactly <n>
+    McNuggets, or None if that is not possible.
+    Precondition: n >= 0, and <sizes> is non-empty and all positive
+
+    Larger packs are preferred.
+
+    >>> pack_combination(35)
+    {4: 1, 6: 1, 25: 1}
+    >>> pack_combination(13) is None
+    True
+    >>> pack_combination(1000003)
+    {4: 1, 6: 4, 25: 39999}
+    """
+    table = _pack_table(sizes)
+    if not buyable(n, sizes):
+        return None
+    counts = {size * table.unit: 0 for size in table.sizes}
+    amount = n // table.unit
+    largest = table.sizes[-1]
+    if table.frobenius is not None and amount > table.frobenius + largest:
+        # Everything above the Frobenius number is buyable, so the largest
+        # packs can be taken in bulk until just above it.
+        bulk = (amount - table.frobenius - 1) // largest
+        counts[largest * table.unit] += bulk
+        amount -= bulk * largest
+    while amount:
+        for size in reversed(table.sizes):
+            if table.reachable(amount - size):
+                counts[size * table.unit] += 1
+                amount -= size
+                break
+    return counts
+
+
+def _combine_depths(seen: Optional[Tuple[int, int, bool]],
+                    value: Tuple[int, bool]) -> Tuple[int, int, bool]:
+    """Fold the (depth, consistent) <value> of one item of a list into the
+    (depth of its first item, greatest depth, consistent so far) triple
+    <seen> for the items before it (None if there are none).
+    """
+    if seen is None:
+        return value[0], value[0], value[1]
+    return (seen[0], max(seen[1], value[0]),
+            seen[2] and value[1] and value[0] == seen[0])
+
+
+def _finish_depths(seen: Optional[Tuple[int, int, bool]]
+                   ) -> Tuple[int, bool]:
+    """Return the (depth, consistent) value of a list from the triple that
+    _combine_depths folded its items into.
+    """
+    if seen is None:
+        return 1, True
+    return seen[1] + 1, seen[2]
+
+
+def _inconsistent(seen: Optional[Tuple[int, int, bool]]) -> bool:
+    """Return whether <seen> already shows a list to be inconsistent.
+    """
+    return seen is not None and not seen[2]
 
 
 def consistent_depth(obj: Union[int, list]) -> bool:
     """Return True iff obj is nested to a consistent depth
     throughout.
+
+    This takes one pass: the depth of each sublist is worked out once, from
+    the depths of its items, and compared with its siblings' as soon as it
+    is known, stopping at the first mismatch.
+
     >>> consistent_depth(6)
     True
     >>> consistent_depth([1, 2, 3, 4])
@@ -91,17 +416,10 @@ def consistent_depth(obj: Union[int, list]) -> bool:
     >>> consistent_depth([[1], [[2], [3], [4], []]])
     False
     """
-    if isinstance(obj, int):
-        return True
-    elif obj == []:
-        return True
-    else:
-        initial_depth = depth(obj[0])
-        for sublist in obj:
-            consistence = (initial_depth == depth(sublist)) and consistent_depth(sublist)
-            if not consistence:
-                return False
-        return True
+    if isinstance(obj, FlatNested):
+        return obj.consistent_depth()
+    return _fold(obj, lambda item: (0, True), None, _combine_depths,
+                 _finish_depths, _inconsistent)[1]
 
 
 def depth(obj: Union[int, list]) -> int:
@@ -109,32 +427,233 @@ def depth(obj: Union[int, list]) -> int:
     >>> depth([[[1]]])
     3
     """
-    if isinstance(obj, int):
-        return 0
-    elif not obj:
-        return 1
-    else:
-        depths = []
-        for sublist in obj:
-            depths.append(1+depth(sublist))
-        if depths:
-            return max(depths)
-        else:
-            return 0
+    if isinstance(obj, FlatNested):
+        return obj.depth()
+    return _fold(obj, lambda item: 0, 0, max, lambda deepest: deepest + 1)
+
+
+class Profile(NamedTuple):
+    """A summary of a nested list, as returned by profile().
+
+    === Attributes ===
+    depth:
+        The depth of the nested list, as returned by depth().
+    consistent:
+        Whether it is nested to a consistent depth, as consistent_depth().
+    leaves:
+        The number of ints in it.
+    matches:
+        How many times each int occurs in it, so that matches[n] is
+        count_matches(obj, n).
+    """
+    depth: int
+    consistent: bool
+    leaves: int
+    matches: Counter
+
+
+def profile(obj: Union[int, list]) -> Profile:
+    """Return the depth, consistency, leaf count and leaf counts by value of
+    <obj>, all found in one traversal.
+
+    >>> summary = profile([10, [[20]], [10, [10]]])
+    >>> summary.depth, summary.consistent, summary.leaves
+    (3, False, 4)
+    >>> summary.matches[10], summary.matches[30]
+    (3, 0)
+    """
+    matches = Counter()
+
+    def leaf(item: int) -> Tuple[int, bool]:
+        matches[item] += 1
+        return 0, True
+
+    depth_, consistent = _fold(obj, leaf, None, _combine_depths,
+                               _finish_depths)
+    return Profile(depth_, consistent, sum(matches.values()), matches)
+
+
+class FlatNested:
+    """A nested list of ints stored level by level in flat arrays, the way
+    Apache Arrow stores list arrays, so that queries over it run as a few
+    vectorized NumPy operations instead of one interpreter step per item.
+
+    Level 0 holds the nested list itself, and level k + 1 holds the items
+    of the lists in level k, left to right. Unlike Arrow, ints and lists may
+    be mixed within a level. Requires NumPy.
+
+    >>> flat = FlatNested([10, [[20]], [10, [10]]])
+    >>> flat.values
+    array([10, 10, 20, 10])
+    >>> flat.to_nested()
+    [10, [[20]], [10, [10]]]
+    >>> count_matches(flat, 10), all_greater_than(flat, 9), depth(flat)
+    (3, True, 3)
+
+    === Attributes ===
+    values:
+        The ints in every level, in level order.
+    offsets:
+        For each level, an int64 array with one more entry than the level
+        has items: the items of level k + 1 inside item i of level k are
+        those from offsets[k][i] up to offsets[k][i + 1]. Ints own none.
+    leaves:
+        For each level, a bool array marking which of its items are ints.
+    """
+    values: Any
+    offsets: List[Any]
+    leaves: List[Any]
+
+    def __init__(self, obj: Union[int, list]) -> None:
+        """Initialize a flat copy of the nested list <obj>.
+        """
+        if numpy is None:
+            raise ImportError('FlatNested requires NumPy')
+        values = []
+        self.offsets = []
+        self.leaves = []
+        level = [obj]
+        while level:
+            leaf = numpy.fromiter((isinstance(item, int) for item in level),
+                                  bool, len(level))
+            sizes = numpy.fromiter(
+                (0 if isinstance(item, int) else len(item) for item in level),
+                numpy.int64, len(level))
+            offsets = numpy.zeros(len(level) + 1, numpy.int64)
+            numpy.cumsum(sizes, out=offsets[1:])
+            values.extend(item for item in level if isinstance(item, int))
+            self.leaves.append(leaf)
+            self.offsets.append(offsets)
+            level = [child for item in level if not isinstance(item, int)
+                     for child in item]
+        self.values = numpy.array(values, numpy.int64)
+
+    def to_nested(self) -> Union[int, list]:
+        """Return this as a nested Python list.
+        """
+        end = len(self.values)
+        below = []
+        for leaf, offsets in zip(reversed(self.leaves),
+                                 reversed(self.offsets)):
+            start = end - int(numpy.count_nonzero(leaf))
+            values = iter(self.values[start:end].tolist())
+            offsets = offsets.tolist()
+            below = [next(values) if is_leaf
+                     else below[offsets[i]:offsets[i + 1]]
+                     for i, is_leaf in enumerate(leaf.tolist())]
+            end = start
+        return below[0]
+
+    def count_matches(self, n: int) -> int:
+        """Return the number of times that n occurs in this nested list.
+        """
+        return int(numpy.count_nonzero(self.values == n))
+
+    def all_greater_than(self, n: int) -> bool:
+        """Return True iff all the ints in this nested list are greater
+        than n.
+        """
+        return bool((self.values > n).all())
+
+    def depth(self) -> int:
+        """Return the depth of this nested list.
+
+        Every level but the last holds a list with items, so the depth is
+        the index of the last level, plus one if it holds an (empty) list.
+        """
+        return len(self.leaves) - 1 + int(not self.leaves[-1].all())
+
+    def consistent_depth(self) -> bool:
+        """Return True iff this nested list is nested to a consistent depth
+        throughout.
+
+        The depths of the items in each level are computed from the level
+        below, from the bottom up, with one reduceat per level giving the
+        deepest and shallowest item of every non-empty list.
+        """
+        depths = (~self.leaves[-1]).astype(numpy.int64)
+        for leaf, offsets in zip(reversed(self.leaves[:-1]),
+                                 reversed(self.offsets[:-1])):
+            parents = numpy.flatnonzero(numpy.diff(offsets))
+            deepest = numpy.maximum.reduceat(depths, offsets[parents])
+            shallowest = numpy.minimum.reduceat(depths, offsets[parents])
+            if (deepest != shallowest).any():
+                return False
+            depths = (~leaf).astype(numpy.int64)
+            depths[parents] = deepest + 1
+        return True
+
+
+def _iter_subsequences(lst: List, n: Optional[int]) -> Iterator[List]:
+    """Yield each distinct subsequence of <lst> exactly once, or if <n> is
+    not None, each one whose sum is >= n.
+
+    The subsequences are grown one item at a time from the empty one. Each
+    step only takes the leftmost occurrence of each distinct item still
+    available, so every distinct subsequence is built along exactly one
+    path and no seen-list is needed. When <n> is given, a step is skipped
+    unless adding every remaining positive item afterwards could reach n,
+    so every subsequence that is built leads to at least one that is
+    yielded.
+    """
+    best = [0] * (len(lst) + 1)
+    if n is not None:
+        for i in range(len(lst) - 1, -1, -1):
+            best[i] = best[i + 1] + max(lst[i], 0)
+        if best[0] < n:
+            return
+    stack = [([], 0, 0)]
+    while stack:
+        chosen, total, start = stack.pop()
+        children = []
+        seen = set()
+        for j in range(start, len(lst)):
+            item = lst[j]
+            if item in seen:
+                continue
+            seen.add(item)
+            if n is None:
+                children.append((chosen + [item], 0, j + 1))
+            elif total + item + best[j + 1] >= n:
+                children.append((chosen + [item], total + item, j + 1))
+        stack.extend(reversed(children))
+        if n is None or total >= n:
+            yield chosen
+
+
+def iter_selections(lst: List) -> Iterator[List]:
+    """Yield every selection (subsequence) of <lst>, each distinct one
+    exactly once, without building them all first.
+    Precondition: the items in <lst> are hashable
+
+    >>> list(iter_selections([1, 2, 1]))
+    [[], [1], [1, 2], [1, 2, 1], [1, 1], [2], [2, 1]]
+    """
+    return _iter_subsequences(lst, None)
 
 
 def selections(lst):
-    if not lst:
-        return [[]]
-    else:
-        holder = [lst.copy()]
-        for i in range(len(lst)):
-            l2 = lst.copy()
-            l2.pop(i)
-            for item in selections(l2):
-                if item not in holder:
-                    holder.append(item)
-        return holder
+    """Return a list of every distinct selection (subsequence) of <lst>.
+
+    >>> sorted(selections([1, 2, 3]))
+    [[], [1], [1, 2], [1, 2, 3], [1, 3], [2], [2, 3], [3]]
+    """
+    return list(iter_selections(lst))
+
+
+def iter_big_selections(lst: List[int], n: int) -> Iterator[List[int]]:
+    """Yield every distinct selection of <lst> whose sum is >= n, each
+    exactly once, without building them all first.
+
+    Selections that cannot reach <n> are never built, so stopping early
+    costs nothing for the rest.
+
+    >>> from itertools import islice
+    >>> selections = iter_big_selections(list(range(-50, 50)), 1220)
+    >>> [sum(selection) for selection in islice(selections, 4)]
+    [1220, 1220, 1220, 1220]
+    """
+    return _iter_subsequences(lst, n)
 
 
 def big_selections(lst: List[int], n: int) -> List[List[int]]:
@@ -146,16 +665,88 @@ def big_selections(lst: List[int], n: int) -> List[List[int]]:
 
     >>> sorted(big_selections([1, 2, 3], 4))
     [[1, 2, 3], [1, 3], [2, 3]]
+    >>> sorted(big_selections([-1, 2], 0))
+    [[], [-1, 2], [2]]
     """
-    if not lst:
-        return [[]]
-    else:
-        holder = [lst.copy()]
-        for i in range(len(lst)):
-            l2 = lst.copy()
-            l2.pop(i)
-            for item in selections(l2):
-                if item not in holder and sum(item) >= n:
-                    holder.append(item)
-        return holder
+    return list(iter_big_selections(lst, n))
+
+
+def _subset_sums(lst: List[int]) -> List[int]:
+    """Return the sums of all 2 ** len(lst) subsets of <lst>.
+
+    The sum at index i is that of the items whose positions are the set bits
+    of i.
+    """
+    sums = [0]
+    for item in lst:
+        sums += [total + item for total in sums]
+    return sums
+
+
+def count_big_selections(lst: List[int], n: int) -> int:
+    """Return the number of selections of <lst> whose sum is >= n.
+
+    Selections are counted by the positions they take their items from, so
+    this is len(big_selections(lst, n)) whenever the items of <lst> are
+    distinct; equal items picked from different positions count separately.
+
+    The list is split in half, and for each subset sum of the first half a
+    binary search over the sorted subset sums of the second half counts the
+    subsets that complete it, which takes O(2 ** (len(lst) / 2) * len(lst))
+    time instead of enumerating every selection.
+
+    >>> count_big_selections([1, 2, 3], 4)
+    3
+    >>> count_big_selections(list(range(-10, 14)), 50)
+    577078
+    """
+    half = len(lst) // 2
+    left = _subset_sums(lst[:half])
+    right = sorted(_subset_sums(lst[half:]))
+    return sum(len(right) - bisect_left(right, n - total) for total in left)
+
+
+def top_k_big_selections(lst: List[int], n: int, k: int) -> List[List[int]]:
+    """Return the (at most) <k> selections of <lst> with the largest sums,
+    among those whose sum is >= n, in decreasing order of sum.
+
+    As in count_big_selections, selections are told apart by the positions
+    of their items, so a list with equal items may give equal selections.
+
+    The subset sums of each half of <lst> are sorted in decreasing order,
+    and the best pairs are taken off a heap that starts at the pair of the
+    two largest, so only about k pairs are ever looked at.
+
+    >>> top_k_big_selections([1, 2, 3], 4, 2)
+    [[1, 2, 3], [2, 3]]
+    >>> top_k_big_selections([5, -1, 4], 8, 5)
+    [[5, 4], [5, -1, 4]]
+    """
+    half = len(lst) // 2
+    left_items, right_items = lst[:half], lst[half:]
+    left, right = _subset_sums(left_items), _subset_sums(right_items)
+    left_order = sorted(range(len(left)), key=left.__getitem__, reverse=True)
+    right_order = sorted(range(len(right)), key=right.__getitem__,
+                         reverse=True)
+
+    def pair_sum(i: int, j: int) -> int:
+        return left[left_order[i]] + right[right_order[j]]
 
+    result = []
+    heap = [(-pair_sum(0, 0), 0, 0)]
+    visited = {(0, 0)}
+    while heap and len(result) < k:
+        negated, i, j = heappop(heap)
+        if -negated < n:
+            break
+        left_mask, right_mask = left_order[i], right_order[j]
+        result.append(
+            [item for b, item in enumerate(left_items) if left_mask >> b & 1]
+            + [item for b, item in enumerate(right_items)
+               if right_mask >> b & 1])
+        for pair in [(i + 1, j), (i, j + 1)]:
+            if (pair[0] < len(left) and pair[1] < len(right)
+                    and pair not in visited):
+                visited.add(pair)
+                heappush(heap, (-pair_sum(*pair), *pair))
+    return result
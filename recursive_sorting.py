@@ -1,4 +1,16 @@
-from typing import Any, List, Tuple
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heapify, heappop, heapreplace
+from multiprocessing.shared_memory import SharedMemory
+from typing import (Any, BinaryIO, Callable, Iterable, Iterator, List,
+                    Optional, Tuple)
 
 
 def mergesort(lst: List) -> List:
@@ -51,28 +63,18 @@ def quicksort(lst: List) -> List:
     """Return a sorted list with the same elements as <lst>.
 
     This is a *non-mutating* version of quicksort; it does not mutate the
-    input list.
+    input list. It sorts a copy with quicksort_inplace, which stays fast
+    on sorted and duplicate-heavy input.
 
     >>> quicksort([10, 2, 5, -6, 17, 10])
     [-6, 2, 5, 10, 10, 17]
+    >>> quicksort(list(range(10000))) == list(range(10000))
+    True
     >>>
     """
-    if len(lst) < 2:
-        return lst[:]
-    else:
-        # Pick pivot to be first element.
-        # Could make lots of other choices here (e.g., last, random)
-        pivot = lst[0]
-
-        # Partition rest of list into two halves
-        smaller, bigger = _partition(lst[1:], pivot)
-
-        # Recurse on each partition
-        smaller_sorted = quicksort(smaller)
-        bigger_sorted = quicksort(bigger)
-
-        # Return! Notice the simple combining step
-        return smaller_sorted + [pivot] + bigger_sorted
+    result = lst[:]
+    quicksort_inplace(result)
+    return result
 
 
 def _partition(lst: List, pivot: Any) -> Tuple[List, List]:
@@ -91,3 +93,742 @@ def _partition(lst: List, pivot: Any) -> Tuple[List, List]:
             bigger.append(item)
 
     return smaller, bigger
+
+
+# Subarrays at most this long are finished off with insertion sort by the
+# in-place sorts, which is faster than partitioning or merging them.
+_INSERTION_CUTOFF = 16
+
+
+def _insertion_sort(lst: List, lo: int, hi: int) -> None:
+    """Sort lst[lo:hi] in place, stably.
+    """
+    for i in range(lo + 1, hi):
+        item = lst[i]
+        j = i
+        while j > lo and lst[j - 1] > item:
+            lst[j] = lst[j - 1]
+            j -= 1
+        lst[j] = item
+
+
+def mergesort_inplace(lst: List) -> None:
+    """Sort <lst> in place, stably.
+
+    Unlike mergesort, this allocates a single auxiliary list the size of
+    <lst> and no other: halves are index ranges, and each level of the
+    recursion merges from one of the two lists into the other, so no
+    elements are ever copied back.
+
+    >>> lst = [10, 2, 5, -6, 17, 10]
+    >>> mergesort_inplace(lst)
+    >>> lst
+    [-6, 2, 5, 10, 10, 17]
+    """
+    _mergesort_range(lst[:], lst, 0, len(lst))
+
+
+def _mergesort_range(src: List, dst: List, lo: int, hi: int) -> None:
+    """Sort the items in src[lo:hi] into dst[lo:hi], using src[lo:hi] as
+    scratch space.
+
+    Precondition: src[lo:hi] and dst[lo:hi] hold the same items.
+    """
+    if hi - lo <= _INSERTION_CUTOFF:
+        _insertion_sort(dst, lo, hi)
+        return
+    mid = (lo + hi) // 2
+    # Sort each half of dst into src, then merge the halves back into dst.
+    _mergesort_range(dst, src, lo, mid)
+    _mergesort_range(dst, src, mid, hi)
+    _merge_range(src, dst, lo, mid, hi)
+
+
+def _merge_range(src: List, dst: List, lo: int, mid: int, hi: int) -> None:
+    """Merge the sorted src[lo:mid] and src[mid:hi] into dst[lo:hi].
+
+    Like _merge, this takes from the left run on ties, so it is stable.
+    """
+    i = lo
+    j = mid
+    k = lo
+    # If the runs are already in order, they only need to be copied.
+    if src[mid - 1] > src[mid]:
+        while i < mid and j < hi:
+            if src[i] <= src[j]:
+                dst[k] = src[i]
+                i += 1
+            else:
+                dst[k] = src[j]
+                j += 1
+            k += 1
+    while i < mid:
+        dst[k] = src[i]
+        i += 1
+        k += 1
+    while j < hi:
+        dst[k] = src[j]
+        j += 1
+        k += 1
+
+
+def quicksort_inplace(lst: List) -> None:
+    """Sort <lst> in place.
+
+    Unlike the original list-building quicksort, this partitions by
+    swapping items within <lst>. It is an introsort:
+    - the pivot is the median of three items, or for longer ranges the
+      median of three such medians (the "ninther"), so sorted and reversed
+      input split evenly;
+    - partitioning is three-way, so items equal to the pivot are set aside
+      at once and runs of duplicates cost nothing further;
+    - only the smaller side is sorted recursively, and the larger side by
+      looping, so the recursion is O(log n) deep;
+    - a range still unsorted after 2 * log2(n) partitions is heapsorted,
+      which bounds the worst case at O(n log n).
+
+    >>> lst = [10, 2, 5, -6, 17, 10]
+    >>> quicksort_inplace(lst)
+    >>> lst
+    [-6, 2, 5, 10, 10, 17]
+    >>> lst = [3] * 5000 + [1] * 5000
+    >>> quicksort_inplace(lst)
+    >>> lst[4999:5001]
+    [1, 3]
+    """
+    _quicksort_range(lst, 0, len(lst), 2 * len(lst).bit_length())
+
+
+def _quicksort_range(lst: List, lo: int, hi: int, depth_limit: int) -> None:
+    """Sort lst[lo:hi] in place, falling back to heapsort once more than
+    <depth_limit> nested partitions have been made.
+    """
+    while hi - lo > _INSERTION_CUTOFF:
+        if depth_limit == 0:
+            _heapsort_range(lst, lo, hi)
+            return
+        depth_limit -= 1
+        lt, gt = _partition_range(lst, lo, hi, lst[_pivot_index(lst, lo, hi)])
+        if lt - lo < hi - gt:
+            _quicksort_range(lst, lo, lt, depth_limit)
+            lo = gt
+        else:
+            _quicksort_range(lst, gt, hi, depth_limit)
+            hi = lt
+    _insertion_sort(lst, lo, hi)
+
+
+def _median_of_three(lst: List, i: int, j: int, k: int) -> int:
+    """Return whichever of the indexes <i>, <j> and <k> holds the median of
+    the items there.
+    """
+    if lst[i] < lst[j]:
+        if lst[j] < lst[k]:
+            return j
+        return k if lst[i] < lst[k] else i
+    if lst[i] < lst[k]:
+        return i
+    return k if lst[j] < lst[k] else j
+
+
+def _pivot_index(lst: List, lo: int, hi: int) -> int:
+    """Return the index of a good pivot for partitioning lst[lo:hi]: the
+    median of the first, middle and last items, or for more than 40 items,
+    the median of the medians of three spread-out triples.
+    """
+    mid = (lo + hi) // 2
+    last = hi - 1
+    if hi - lo <= 40:
+        return _median_of_three(lst, lo, mid, last)
+    step = (hi - lo) // 8
+    return _median_of_three(
+        lst,
+        _median_of_three(lst, lo, lo + step, lo + 2 * step),
+        _median_of_three(lst, mid - step, mid, mid + step),
+        _median_of_three(lst, last - 2 * step, last - step, last))
+
+
+def _partition_range(lst: List, lo: int, hi: int,
+                     pivot: Any) -> Tuple[int, int]:
+    """Partition lst[lo:hi] in place into the items < pivot, then those
+    equal to it, then those > pivot, and return the indexes (lt, gt) where
+    the equal items start and end.
+    """
+    lt = lo
+    i = lo
+    gt = hi
+    while i < gt:
+        item = lst[i]
+        if item < pivot:
+            lst[i] = lst[lt]
+            lst[lt] = item
+            lt += 1
+            i += 1
+        elif item > pivot:
+            gt -= 1
+            lst[i] = lst[gt]
+            lst[gt] = item
+        else:
+            i += 1
+    return lt, gt
+
+
+def _heapsort_range(lst: List, lo: int, hi: int) -> None:
+    """Sort lst[lo:hi] in place with heapsort.
+    """
+    size = hi - lo
+    for root in range(size // 2 - 1, -1, -1):
+        _sift_down(lst, lo, root, size)
+    for end in range(size - 1, 0, -1):
+        lst[lo], lst[lo + end] = lst[lo + end], lst[lo]
+        _sift_down(lst, lo, 0, end)
+
+
+def _sift_down(lst: List, lo: int, root: int, size: int) -> None:
+    """Restore the max-heap order of the heap in lst[lo:lo + size] below
+    position <root>, where only the item at <root> may be out of place.
+    """
+    item = lst[lo + root]
+    child = 2 * root + 1
+    while child < size:
+        if child + 1 < size and lst[lo + child] < lst[lo + child + 1]:
+            child += 1
+        if not item < lst[lo + child]:
+            break
+        lst[lo + root] = lst[lo + child]
+        root = child
+        child = 2 * root + 1
+    lst[lo + root] = item
+
+
+# Lists shorter than this are sorted serially by parallel_mergesort, since
+# starting worker processes would take longer than the sort.
+_PARALLEL_THRESHOLD = 50_000
+
+
+def parallel_mergesort(lst: List, workers: Optional[int] = None) -> List:
+    """Return a sorted list with the same elements as <lst>, sorting
+    chunks of it in <workers> processes (by default, one per CPU).
+
+    Like mergesort, this is stable and does not mutate <lst>. Lists shorter
+    than _PARALLEL_THRESHOLD are sorted with mergesort directly.
+
+    A list of only ints (that fit in 64 bits) or only floats is copied once
+    into shared memory, which each worker sorts its own slice of, so the
+    items are never pickled. Other lists are sent to the workers in chunks.
+    The sorted chunks are then merged with _kway_merge.
+
+    >>> lst = [i * 7919 % 100003 for i in range(100003)]
+    >>> parallel_mergesort(lst, workers=2) == sorted(lst)
+    True
+    >>> parallel_mergesort([(1, 'b'), (0, 'a')] * 30000, 2)[29999:30001]
+    [(0, 'a'), (1, 'b')]
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 2 or len(lst) < _PARALLEL_THRESHOLD:
+        return mergesort(lst)
+    bounds = [len(lst) * i // workers for i in range(workers + 1)]
+    ranges = list(zip(bounds, bounds[1:]))
+    typecode = _shared_typecode(lst)
+    with ProcessPoolExecutor(workers) as executor:
+        if typecode is None:
+            return _kway_merge(list(executor.map(
+                _sorted_chunk, [lst[lo:hi] for lo, hi in ranges])))
+        shared = SharedMemory(create=True, size=len(lst) * 8)
+        try:
+            # The block may be rounded up to a whole page, so only its
+            # first len(lst) * 8 bytes are viewed.
+            with shared.buf[:len(lst) * 8] as raw, \
+                    raw.cast(typecode) as view:
+                view[:] = array(typecode, lst)
+                for unused_ in executor.map(_sort_shared_range,
+                                            [shared.name] * workers,
+                                            [typecode] * workers,
+                                            *zip(*ranges)):
+                    pass
+                runs = [view[lo:hi].tolist() for lo, hi in ranges]
+        finally:
+            shared.close()
+            shared.unlink()
+    return _kway_merge(runs)
+
+
+def _shared_typecode(lst: List) -> Optional[str]:
+    """Return the array typecode that can hold every item of <lst> exactly,
+    'q' for 64-bit ints or 'd' for floats, or None if there is none.
+    """
+    if all(type(item) is float for item in lst):
+        return 'd'
+    if all(type(item) is int for item in lst):
+        try:
+            array('q', (min(lst), max(lst)))
+        except OverflowError:
+            return None
+        return 'q'
+    return None
+
+
+def _sorted_chunk(chunk: List) -> List:
+    """Sort <chunk> in place, stably, and return it.
+    """
+    mergesort_inplace(chunk)
+    return chunk
+
+
+def _sort_shared_range(name: str, typecode: str, lo: int, hi: int) -> None:
+    """Stably sort the items lo to hi of the array of <typecode> items in
+    the shared memory block called <name>.
+    """
+    shared = SharedMemory(name)
+    try:
+        with shared.buf[lo * 8:hi * 8] as raw, raw.cast(typecode) as view:
+            view[:] = array(typecode, _sorted_chunk(view.tolist()))
+    finally:
+        shared.close()
+
+
+def _kway_merge(runs: List[List]) -> List:
+    """Return a sorted list with the elements in every list in <runs>.
+
+    This is _merge for any number of lists: a heap holds the next item of
+    every run, and ties go to the run that comes first in <runs>, so the
+    merge is stable.
+
+    Precondition: every list in <runs> is sorted.
+
+    >>> _kway_merge([[1, 4], [2, 3, 5], [], [0]])
+    [0, 1, 2, 3, 4, 5]
+    """
+    heap = [(run[0], i, 0) for i, run in enumerate(runs) if run]
+    heapify(heap)
+    merged = []
+    while len(heap) > 1:
+        item, i, j = heap[0]
+        merged.append(item)
+        j += 1
+        if j < len(runs[i]):
+            heapreplace(heap, (runs[i][j], i, j))
+        else:
+            heappop(heap)
+    if heap:
+        unused_, i, j = heap[0]
+        merged.extend(runs[i][j:])
+    return merged
+
+
+# Records in the run files spilled by external_sort are each stored as this
+# length prefix followed by the record's bytes.
+_RECORD_LENGTH = struct.Struct('<I')
+
+# The most runs that external_sort merges at once; more runs are first
+# merged in groups of this many, to keep the number of open files bounded.
+_MERGE_FAN_IN = 64
+
+
+def external_sort(input_path: str, output_path: str,
+                  memory_limit: int = 64 * 2 ** 20,
+                  use_mmap: bool = False) -> None:
+    """Sort the lines of the file at <input_path> into the file at
+    <output_path>, holding only about <memory_limit> bytes of lines in
+    memory at a time.
+
+    Lines are compared as bytes, without their line endings, and the sort
+    is stable. See iter_external_sort for how it works.
+    """
+    with open(output_path, 'wb') as output:
+        for record in iter_external_sort(input_path, memory_limit, use_mmap):
+            output.write(record)
+            output.write(b'\n')
+
+
+def iter_external_sort(input_path: str, memory_limit: int = 64 * 2 ** 20,
+                       use_mmap: bool = False) -> Iterator[bytes]:
+    """Yield the lines of the file at <input_path> in sorted order, without
+    their line endings, holding only about <memory_limit> bytes of lines in
+    memory at a time.
+
+    The file is read in runs that fit in <memory_limit>, each sorted with
+    mergesort_inplace and spilled to a temporary file as length-prefixed
+    records. The runs are then streamed through a stable k-way merge (in
+    several passes if there are more than _MERGE_FAN_IN of them) and read
+    back through a buffer, or through mmap if <use_mmap> is true. An input
+    that fits in one run is never written out. The temporary files are
+    removed once the generator finishes or is closed.
+
+    >>> import os
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     path = os.path.join(directory, 'records.txt')
+    ...     with open(path, 'wb') as f:
+    ...         for i in range(101):
+    ...             _ = f.write(b'%d\\n' % (i * 37 % 101))
+    ...     records = list(iter_external_sort(path, memory_limit=1000))
+    >>> records[:3], len(records)
+    ([b'0', b'1', b'10'], 101)
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        runs = []
+        with open(input_path, 'rb') as source:
+            for run in _read_runs(source, memory_limit):
+                if not runs and run.last:
+                    yield from run.records
+                    return
+                runs.append(_spill_run(directory, run.records))
+        while len(runs) > _MERGE_FAN_IN:
+            group, runs = runs[:_MERGE_FAN_IN], runs[_MERGE_FAN_IN:]
+            merged = imerge(*[_iter_run(path, use_mmap) for path in group])
+            runs.append(_spill_run(directory, merged))
+            for path in group:
+                os.remove(path)
+        yield from imerge(*[_iter_run(path, use_mmap) for path in runs])
+
+
+class _Run:
+    """A sorted run of records read by _read_runs.
+
+    === Attributes ===
+    records:
+        The records in the run, in sorted order.
+    last:
+        Whether this is the last run in the input.
+    """
+    __slots__ = ('records', 'last')
+    records: List[bytes]
+    last: bool
+
+    def __init__(self, records: List[bytes], last: bool) -> None:
+        """Initialize a run of the sorted <records>.
+        """
+        self.records = records
+        self.last = last
+
+
+def _read_runs(source: BinaryIO, memory_limit: int) -> Iterator[_Run]:
+    """Yield the lines of <source>, without their line endings, in
+    consecutive sorted runs that each take up about <memory_limit> bytes.
+    """
+    records = []
+    used = 0
+    for line in source:
+        if line.endswith(b'\n'):
+            line = line[:-1]
+        records.append(line)
+        # The bytes object, plus its slot in the list.
+        used += sys.getsizeof(line) + 8
+        if used >= memory_limit:
+            mergesort_inplace(records)
+            yield _Run(records, False)
+            records = []
+            used = 0
+    mergesort_inplace(records)
+    yield _Run(records, True)
+
+
+def _spill_run(directory: str, records: Iterable[bytes]) -> str:
+    """Write the sorted <records> to a new run file in <directory>, and
+    return its path.
+    """
+    fd, path = tempfile.mkstemp(dir=directory, suffix='.run')
+    with open(fd, 'wb', buffering=2 ** 16) as run:
+        for record in records:
+            run.write(_RECORD_LENGTH.pack(len(record)))
+            run.write(record)
+    return path
+
+
+def _iter_run(path: str, use_mmap: bool) -> Iterator[bytes]:
+    """Yield the records in the run file at <path>, reading it through
+    mmap if <use_mmap> is true, or else through a buffer.
+    """
+    header = _RECORD_LENGTH.size
+    with open(path, 'rb', buffering=2 ** 16) as run:
+        if not use_mmap:
+            while True:
+                prefix = run.read(header)
+                if not prefix:
+                    return
+                yield run.read(_RECORD_LENGTH.unpack(prefix)[0])
+        if os.fstat(run.fileno()).st_size == 0:
+            return
+        with mmap.mmap(run.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position = 0
+            while position < len(mapped):
+                size, = _RECORD_LENGTH.unpack_from(mapped, position)
+                position += header
+                yield mapped[position:position + size]
+                position += size
+
+
+def imerge(*iterables: Iterable) -> Iterator:
+    """Yield the items of every one of <iterables> in sorted order, taking
+    one item at a time from each, so nothing is read before it is needed.
+
+    This is a lazy _kway_merge: ties go to the iterable that comes first,
+    so the merge is stable.
+
+    Precondition: every one of <iterables> is sorted.
+
+    >>> merged = imerge([1, 4, 9], iter([2, 3]), range(5, 8))
+    >>> next(merged), next(merged)
+    (1, 2)
+    >>> list(merged)
+    [3, 4, 5, 6, 7, 9]
+    """
+    iterators = [iter(iterable) for iterable in iterables]
+    heap = []
+    for i, iterator in enumerate(iterators):
+        for item in iterator:
+            heap.append((item, i))
+            break
+    heapify(heap)
+    while len(heap) > 1:
+        item, i = heap[0]
+        yield item
+        for item in iterators[i]:
+            heapreplace(heap, (item, i))
+            break
+        else:
+            heappop(heap)
+    if heap:
+        item, i = heap[0]
+        yield item
+        yield from iterators[i]
+
+
+# natural_mergesort extends natural runs shorter than this with insertion
+# sort, so that random input does not become a great many tiny runs.
+_MIN_RUN = 32
+
+
+def natural_mergesort(lst: List, key: Optional[Callable[[Any], Any]] = None,
+                      reverse: bool = False) -> List:
+    """Return a sorted list with the same elements as <lst>, ordered by
+    key(element) if <key> is given, and in descending order if <reverse> is
+    true. Like mergesort, this is stable (also when reversed) and does not
+    mutate <lst>.
+
+    Instead of splitting at the midpoint, this finds the runs that are
+    already in order, reversing the strictly descending ones, and merges
+    neighbouring runs off a stack kept balanced as in Timsort, so input
+    that is mostly sorted takes close to linear time. key() is called once
+    per element, and the keys are moved alongside the elements.
+
+    >>> natural_mergesort([10, 2, 5, -6, 17, 10])
+    [-6, 2, 5, 10, 10, 17]
+    >>> natural_mergesort(['bb', 'a', 'cc', 'd'], key=len, reverse=True)
+    ['bb', 'cc', 'a', 'd']
+    >>> calls = []
+    >>> natural_mergesort([3, 1, 2], key=lambda x: calls.append(x) or -x)
+    [3, 2, 1]
+    >>> len(calls)
+    3
+    """
+    items = lst[:]
+    keys = items[:] if key is None else [key(item) for item in items]
+    if reverse:
+        # Sorting the reversed list and reversing the result keeps equal
+        # elements in their original order.
+        items.reverse()
+        keys.reverse()
+    runs = []
+    lo = 0
+    while lo < len(items):
+        hi = _natural_run(keys, items, lo)
+        if hi - lo < _MIN_RUN:
+            end = min(lo + _MIN_RUN, len(items))
+            _binary_insertion_sort(keys, items, lo, hi, end)
+            hi = end
+        runs.append((lo, hi - lo))
+        _collapse_runs(keys, items, runs)
+        lo = hi
+    while len(runs) > 1:
+        i = len(runs) - 2
+        if i > 0 and runs[i - 1][1] < runs[i + 1][1]:
+            i -= 1
+        _merge_runs_at(keys, items, runs, i)
+    if reverse:
+        items.reverse()
+    return items
+
+
+def _natural_run(keys: List, items: List, lo: int) -> int:
+    """Return the end of the natural run in keys that starts at <lo>: the
+    longest non-descending or strictly descending stretch. A descending run
+    is reversed in place, in <items> too, so that it ascends.
+    """
+    end = lo + 1
+    if end == len(keys):
+        return end
+    end += 1
+    if keys[lo + 1] < keys[lo]:
+        while end < len(keys) and keys[end] < keys[end - 1]:
+            end += 1
+        keys[lo:end] = keys[lo:end][::-1]
+        items[lo:end] = items[lo:end][::-1]
+    else:
+        while end < len(keys) and not keys[end] < keys[end - 1]:
+            end += 1
+    return end
+
+
+def _binary_insertion_sort(keys: List, items: List, lo: int, start: int,
+                           hi: int) -> None:
+    """Stably sort keys[lo:hi] in place, moving <items> alongside, given
+    that keys[lo:start] is already sorted.
+    """
+    for i in range(start, hi):
+        key = keys[i]
+        item = items[i]
+        position = bisect_right(keys, key, lo, i)
+        keys[position + 1:i + 1] = keys[position:i]
+        items[position + 1:i + 1] = items[position:i]
+        keys[position] = key
+        items[position] = item
+
+
+def _collapse_runs(keys: List, items: List, runs: List[Tuple[int, int]]
+                   ) -> None:
+    """Merge runs at the top of the stack of (start, length) <runs> until
+    every run is longer than the two above it combined, and longer than the
+    one above it. This keeps the stack O(log n) deep and the merges
+    balanced.
+    """
+    while len(runs) > 1:
+        i = len(runs) - 2
+        if ((i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1])
+                or (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1])):
+            if runs[i - 1][1] < runs[i + 1][1]:
+                i -= 1
+        elif runs[i][1] > runs[i + 1][1]:
+            return
+        _merge_runs_at(keys, items, runs, i)
+
+
+def _merge_runs_at(keys: List, items: List, runs: List[Tuple[int, int]],
+                   i: int) -> None:
+    """Merge the adjacent runs runs[i] and runs[i + 1] of keys in place,
+    moving <items> alongside.
+
+    The items at the start of the left run that are already no greater
+    than the right run's first item, and those at the end of the right run
+    that are already no less than the left run's last item, are left where
+    they are; only what remains of the left run is copied out.
+    """
+    lo, left_length = runs[i]
+    mid = lo + left_length
+    hi = mid + runs[i + 1][1]
+    runs[i:i + 2] = [(lo, hi - lo)]
+    lo = bisect_right(keys, keys[mid], lo, mid)
+    if lo == mid:
+        return
+    hi = bisect_left(keys, keys[mid - 1], mid, hi)
+    left_keys = keys[lo:mid]
+    left_items = items[lo:mid]
+    i = 0
+    j = mid
+    k = lo
+    while i < len(left_keys) and j < hi:
+        if keys[j] < left_keys[i]:
+            keys[k] = keys[j]
+            items[k] = items[j]
+            j += 1
+        else:
+            keys[k] = left_keys[i]
+            items[k] = left_items[i]
+            i += 1
+        k += 1
+    keys[k:j] = left_keys[i:]
+    items[k:j] = left_items[i:]
+
+
+def select(lst: List, i: int) -> Any:
+    """Return the item that would be at index <i> if <lst> were sorted,
+    without sorting it or mutating <lst>.
+    Precondition: 0 <= i < len(lst)
+
+    This is quickselect: _partition splits the items around a random pivot
+    and only the side holding index <i> is kept, which takes O(n) expected
+    time. As in introselect, if that has not finished after 2 * log2(n)
+    rounds, the remaining items are sorted with quicksort instead, so the
+    worst case is O(n log n).
+
+    >>> select([10, 2, 5, -6, 17, 10], 0)
+    -6
+    >>> select([10, 2, 5, -6, 17, 10], 3)
+    10
+    >>> select([7] * 1000, 500)
+    7
+    """
+    rounds = 2 * len(lst).bit_length()
+    while rounds > 0:
+        rounds -= 1
+        pivot = random.choice(lst)
+        smaller, bigger = _partition(lst, pivot)
+        if i >= len(smaller):
+            lst = bigger
+            i -= len(smaller)
+        else:
+            # <smaller> also holds the items equal to the pivot.
+            lst = [item for item in smaller if item < pivot]
+            if i >= len(lst):
+                return pivot
+    return quicksort(lst)[i]
+
+
+def partial_sort(lst: List, k: int) -> None:
+    """Rearrange <lst> in place so that lst[:k] holds its <k> smallest
+    items in sorted order. The rest of <lst> is left in no particular
+    order.
+
+    The k smallest items are moved to the front with an in-place
+    introselect (the partitioning and pivots of quicksort_inplace, falling
+    back to heapsort), and only they are then sorted, which takes
+    O(n + k log k) time.
+
+    >>> lst = [10, 2, 5, -6, 17, 10]
+    >>> partial_sort(lst, 3)
+    >>> lst[:3]
+    [-6, 2, 5]
+    """
+    k = min(k, len(lst))
+    if k <= 0:
+        return
+    if k < len(lst):
+        _select_range(lst, 0, len(lst), k)
+    _quicksort_range(lst, 0, k, 2 * k.bit_length())
+
+
+def _select_range(lst: List, lo: int, hi: int, k: int) -> None:
+    """Rearrange lst[lo:hi] in place so that lst[k] is the item that would
+    be there if lst[lo:hi] were sorted, with no greater items before it and
+    no smaller items after it.
+    Precondition: lo <= k < hi
+    """
+    depth_limit = 2 * (hi - lo).bit_length()
+    while hi - lo > _INSERTION_CUTOFF:
+        if depth_limit == 0:
+            _heapsort_range(lst, lo, hi)
+            return
+        depth_limit -= 1
+        lt, gt = _partition_range(lst, lo, hi, lst[_pivot_index(lst, lo, hi)])
+        if k < lt:
+            hi = lt
+        elif k >= gt:
+            lo = gt
+        else:
+            return
+    _insertion_sort(lst, lo, hi)
+
+
+def nsmallest(lst: List, k: int) -> List:
+    """Return the <k> smallest items in <lst>, in sorted order, without
+    mutating <lst>.
+
+    >>> nsmallest([10, 2, 5, -6, 17, 10], 2)
+    [-6, 2]
+    >>> nsmallest([3, 1], 5)
+    [1, 3]
+    """
+    result = lst[:]
+    partial_sort(result, k)
+    return result[:max(k, 0)]